@@ -3,8 +3,8 @@ Main package initialization.
 This module provides the core functionality for the AI agent system.
 """
 
-from .crew import Main, TaskMasterCrew, CrewFactory
-from .utils.mlflow_manager import MLflowManager
+from .crew import Main, TaskMasterCrew, CrewFactory, AsyncBatcher
+from .utils.mlflow_manager import MLflowManager, get_manager
 
 __version__ = '0.1.0'
 __author__ = 'Your Name'
@@ -14,5 +14,7 @@ __all__ = [
     'Main',
     'TaskMasterCrew',
     'CrewFactory',
-    'MLflowManager'
+    'AsyncBatcher',
+    'MLflowManager',
+    'get_manager'
 ]
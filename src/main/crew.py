@@ -1,11 +1,103 @@
-from os import startfile
+import asyncio
+import copy
+import functools
+import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
-from src.main.utils.mlflow_manager import MLflowManager
+from .utils.mlflow_manager import get_manager
 import os
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+@functools.lru_cache(maxsize=32)
+def _parse_yaml(config_path, mtime_ns):
+    """Parse a YAML file; ``mtime_ns`` is part of the cache key so edits are picked up."""
+    with open(config_path, 'r') as file:
+        return yaml.load(file, Loader=_YamlLoader)
+
+@functools.lru_cache(maxsize=32)
+def _load_yaml_snapshot(config_path, source_mtime_ns):
+    """
+    Load a YAML file through a JSON sidecar cache (``<path>.cache.json``).
+
+    The sidecar records the source file's mtime and is only used while it still
+    matches, so editing the YAML invalidates it automatically. Configs that JSON
+    can't represent exactly are not cached. Results are also
+    memoized in-process per (path, mtime), so repeated ``Main()`` constructions
+    touch neither file.
+    """
+    cache_path = config_path + ".cache.json"
+
+    try:
+        with open(cache_path, 'r') as file:
+            cached = json.load(file)
+        if cached.get("source_mtime_ns") == source_mtime_ns:
+            return cached["config"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+
+    with open(config_path, 'r') as file:
+        config = yaml.load(file, Loader=_YamlLoader)
+
+    # JSON can't hold every YAML value: dates raise, and non-string mapping keys
+    # silently become strings. Only cache configs that come back from JSON unchanged
+    try:
+        payload = json.dumps({"source_mtime_ns": source_mtime_ns, "config": config})
+    except (TypeError, ValueError):
+        return config
+    if json.loads(payload)["config"] != config:
+        return config
+
+    # Write to a temp file first so concurrent starts never read a partial cache
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w') as file:
+            file.write(payload)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Read-only checkout: just skip the cache
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return config
+
+def _load_yaml_cached(config_path):
+    """Return a private copy of the cached config; CrewBase mutates what it loads."""
+    config_path = str(config_path)
+    return copy.deepcopy(_load_yaml_snapshot(config_path, os.stat(config_path).st_mtime_ns))
+
+def _fan_out(tasks):
+    """
+    Order tasks by dependency level and mark independent ones for async execution.
+
+    A task's level is one past the deepest task in its ``context``; tasks without an
+    explicit context depend on everything before them, as in a sequential run. Within
+    each level all tasks but the last get ``async_execution=True``: CrewAI runs
+    consecutive async tasks concurrently and joins them at the next synchronous task,
+    so every level fans out and fans back in before the next one starts.
+    """
+    levels = {}
+    deepest = -1
+    for task in tasks:
+        if isinstance(task.context, list):
+            level = 1 + max((levels.get(id(upstream), 0) for upstream in task.context), default=-1)
+        else:
+            level = deepest + 1
+        levels[id(task)] = level
+        deepest = max(deepest, level)
+
+    ordered = sorted(tasks, key=lambda t: levels[id(t)])
+    for i, task in enumerate(ordered):
+        is_last_in_level = i + 1 == len(ordered) or levels[id(ordered[i + 1])] != levels[id(task)]
+        task.async_execution = not is_last_in_level
+    return ordered
+
 # If you want to run a snippet of code before or after the crew starts,
 # you can use the @before_kickoff and @after_kickoff decorators
 # https://docs.crewai.com/concepts/crews#example-crew-class-with-decorators
@@ -53,37 +145,79 @@ class Main():
         )
 
     @crew
-    def crew(self) -> Crew:
+    def crew(self, parallel: bool = None) -> Crew:
         """Creates the Main crew"""
         # To learn how to add knowledge sources to your crew, check out the documentation:
         # https://docs.crewai.com/concepts/knowledge#what-is-knowledge
 
+        # PROCESS=parallel runs tasks without upstream dependencies concurrently
+        if parallel is None:
+            parallel = os.environ.get("PROCESS", "sequential") == "parallel"
+
         return Crew(
             agents=self.agents, # Automatically created by the @agent decorator
-            tasks=self.tasks, # Automatically created by the @task decorator
+            tasks=_fan_out(self.tasks) if parallel else self.tasks, # Automatically created by the @task decorator
             process=Process.sequential,
             verbose=True,
             # process=Process.hierarchical, # In case you wanna use that instead https://docs.crewai.com/how-to/Hierarchical/
         )
 
+# CrewBase parses agents_config/tasks_config through load_yaml on every Main();
+# route it through the in-process and sidecar caches instead
+Main.load_yaml = staticmethod(_load_yaml_cached)
+
 class TaskMasterCrew:
     def __init__(self):
         # Existing initialization code
-        self.mlflow_manager = MLflowManager()
+        self.mlflow_manager = get_manager()
 
     def kickoff(self, inputs):
-        with self.mlflow_manager.start_run(inputs.get("request_id")):
+        start_time = time.time()
+        with self.mlflow_manager.start_run(run_name=inputs.get("request_id")):
             # Execute existing workflow
             result = self._execute_workflow(inputs)
 
             # Log workflow completion metrics
             self.mlflow_manager.log_workflow_metrics({
-                "completion_time": time.time() - startfile,
+                "completion_time": time.time() - start_time,
                 "success_rate": 1.0 if result["status"] == "success" else 0.0
             })
 
         return result
 
+    async def kickoff_batch_async(self, inputs_list, max_concurrency=16, semaphore=None, executor=None):
+        """
+        Run ``kickoff`` for every input with at most ``max_concurrency`` in flight.
+
+        Kickoffs are LLM/network bound, so each runs on a worker thread from a pool
+        sized to ``max_concurrency``; results come back in input order. A failed
+        kickoff doesn't cost the batch its other results: its exception is
+        returned in its place. Pass a ``semaphore`` and ``executor`` to share one
+        limit across several batches.
+        """
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=max_concurrency)
+            try:
+                return await self.kickoff_batch_async(inputs_list, max_concurrency, semaphore, executor)
+            finally:
+                # Never block the event loop on the pool; if the batch was cancelled,
+                # drop the kickoffs that haven't started yet
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        loop = asyncio.get_running_loop()
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run_one(inputs):
+            async with semaphore:
+                return await loop.run_in_executor(executor, self.kickoff, inputs)
+
+        return await asyncio.gather(*(run_one(inputs) for inputs in inputs_list), return_exceptions=True)
+
+    def kickoff_batch(self, inputs_list, max_concurrency=16):
+        """Synchronous entry point for ``kickoff_batch_async`` (failed inputs return their exception)."""
+        return asyncio.run(self.kickoff_batch_async(inputs_list, max_concurrency))
+
     def execute_task(self, task):
         start_time = time.time()
         try:
@@ -106,37 +240,138 @@ class TaskMasterCrew:
             })
             raise e
 
+class AsyncBatcher:
+    """
+    Micro-batches kickoff inputs submitted from many coroutines.
+
+    Inputs arriving within ``max_batch_time`` seconds of each other (up to
+    ``max_batch_size``) are grouped and fired together through
+    ``TaskMasterCrew.kickoff_batch_async``. Batches may overlap, but they share
+    one semaphore and thread pool, so at most ``max_concurrency`` kickoffs run
+    at once across all of them. A failed kickoff raises only in the ``submit``
+    call that queued it.
+    """
+
+    def __init__(self, crew, max_batch_size=64, max_batch_time=0.05, max_concurrency=16):
+        self.crew = crew
+        self.max_batch_size = max_batch_size
+        self.max_batch_time = max_batch_time
+        self.max_concurrency = max_concurrency
+        self._queue = None
+        self._worker = None
+        self._semaphore = None
+        self._executor = None
+        self._in_flight = set()
+
+    async def submit(self, inputs):
+        """Queue one kickoff and wait for its result."""
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((inputs, future))
+        return await future
+
+    async def close(self):
+        """Stop the batching worker once queued inputs have been fired."""
+        if self._worker is not None:
+            await self._queue.join()
+            self._worker.cancel()
+            self._worker = None
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_batch_time
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Hold a reference so the batch task isn't garbage collected mid-flight
+            fire = asyncio.create_task(self._fire(batch))
+            self._in_flight.add(fire)
+            fire.add_done_callback(self._in_flight.discard)
+
+    async def _fire(self, batch):
+        try:
+            results = await self.crew.kickoff_batch_async(
+                [inputs for inputs, _ in batch], self.max_concurrency,
+                semaphore=self._semaphore, executor=self._executor
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            # Each caller gets its own kickoff's result or exception
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
 class CrewFactory:
     """Factory for creating CrewAI crews with MLflow integration."""
 
     def __init__(self):
-        self.mlflow_manager = MLflowManager()
+        self.mlflow_manager = get_manager()
 
     def load_config(self, config_path):
-        """Load configuration from YAML file."""
-        with open(config_path, 'r') as file:
-            return yaml.safe_load(file)
+        """Load configuration from YAML file, reusing the parse while the file is unchanged."""
+        config = _parse_yaml(config_path, os.stat(config_path).st_mtime_ns)
+        # Hand out a copy so callers can't mutate the cached parse
+        return copy.deepcopy(config)
 
     def create_crew(self, name, agents, tasks):
         """Create a crew with MLflow tracking."""
+        process = os.environ.get("PROCESS", "sequential")
+        if process == "parallel":
+            # Fan out independent tasks within a sequential process
+            tasks = _fan_out(tasks)
+            process = Process.sequential
+
         crew = Crew(
             agents=agents,
             tasks=tasks,
             verbose=True,
-            process=os.environ.get("PROCESS", "sequential")
+            process=process
         )
 
+        # Index agents by role (crewai agents have no name) so lookups don't scan the agent list
+        agent_map = {agent.role: agent for agent in agents}
+        crew._agent_map = agent_map
+
         # Patch crew's kickoff method to add MLflow tracking
         original_kickoff = crew.kickoff
 
+        # Built once per crew rather than on every kickoff
+        task_snippets = [task.description[:50] for task in tasks]
+
         def kickoff_with_mlflow(inputs=None):
             start_time = time.time()
 
             # Start MLflow run
             with self.mlflow_manager.start_run(run_name=name):
-                self.mlflow_manager.log_param("crew_name", name)
-                self.mlflow_manager.log_param("agents", [agent.name for agent in agents])
-                self.mlflow_manager.log_param("tasks", [task.description[:50] for task in tasks])
+                self.mlflow_manager.log_batch(params={
+                    "crew_name": name,
+                    "agents": list(agent_map),
+                    "tasks": task_snippets
+                })
 
                 try:
                     # Run original kickoff method
@@ -155,10 +390,17 @@ class CrewFactory:
                     execution_time = time.time() - start_time
                     self.mlflow_manager.log_workflow_metrics({
                         "execution_time": execution_time,
-                        "success": 0.0,
-                        "error": str(e)
+                        "success": 0.0
                     })
+                    self.mlflow_manager.log_batch(tags={"workflow.error": str(e)})
                     raise e
 
-        crew.kickoff = kickoff_with_mlflow
+        # Crew is a pydantic model that rejects assigning undeclared attributes,
+        # so shadow its kickoff method on the instance directly
+        object.__setattr__(crew, "kickoff", kickoff_with_mlflow)
         return crew
+
+    @staticmethod
+    def get_agent(crew, role):
+        """Look up an agent of a crew built by ``create_crew`` by its ``role``."""
+        return crew._agent_map[role]
@@ -2,6 +2,7 @@
 import sys
 import warnings
 import subprocess
+import socket
 import os
 import time
 
@@ -21,6 +22,9 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+MLFLOW_HOST = "127.0.0.1"
+MLFLOW_PORT = 5000
+
 def start_mlflow_server():
     """Start the MLflow tracking server with PostgreSQL backend"""
     # Get PostgreSQL URI from environment variables - no hardcoding
@@ -31,17 +35,34 @@ def start_mlflow_server():
 
     mlflow_process = subprocess.Popen(
         ["mlflow", "server",
-         "--host", "127.0.0.1",
-         "--port", "5000",
+         "--host", MLFLOW_HOST,
+         "--port", str(MLFLOW_PORT),
          "--backend-store-uri", postgres_uri,
          "--default-artifact-root", "./mlflow-artifacts"],
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE
     )
-    # Wait for server to start
-    time.sleep(2)
+    # Wait until the server accepts connections; don't leave it running if it never does
+    try:
+        wait_for_mlflow_server(mlflow_process)
+    except Exception:
+        mlflow_process.terminate()
+        raise
     return mlflow_process
 
+def wait_for_mlflow_server(mlflow_process, timeout=10.0):
+    """Poll the MLflow port until it accepts connections; raise ``TimeoutError`` after ``timeout`` seconds."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if mlflow_process.poll() is not None:
+            raise RuntimeError(f"MLflow server exited during startup: {mlflow_process.stderr.read().decode()}")
+        try:
+            with socket.create_connection((MLFLOW_HOST, MLFLOW_PORT), timeout=0.1):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise TimeoutError(f"MLflow did not accept connections on {MLFLOW_HOST}:{MLFLOW_PORT} within {timeout}s")
+
 def run():
     """
     Run the crew.
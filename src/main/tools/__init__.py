@@ -27,7 +27,8 @@ from .enhanced import (
 
 from .serper import (
     SerperSearch,
-    SerperNews
+    SerperNews,
+    SearchType
 )
 
 # Export all tool classes
@@ -53,5 +54,6 @@ __all__ = [
 
     # Search Tools
     'SerperSearch',
-    'SerperNews'
+    'SerperNews',
+    'SearchType'
 ]
@@ -6,18 +6,54 @@ for context management, reasoning, and reinforcement learning integration.
 
 import os
 import time
-import json
-import base64
 import hashlib
-from typing import Dict, List, Any, Optional, Type, Union
-from pydantic import BaseModel, Field
+import sqlite3
+import threading
+from secrets import token_hex
+from typing import Dict, List, Any, Optional, Type
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 from datetime import datetime
-import mlflow
 from crewai.tools import BaseTool
-from ..utils.mlflow_manager import MLflowManager
+from ..utils.mlflow_manager import get_manager
+
+try:
+    import orjson
+
+    def _json_loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    _JSONDecodeError = orjson.JSONDecodeError
+except ImportError:
+    import json
+
+    def _json_loads(data: bytes) -> Any:
+        return json.loads(data)
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode()
+
+    _JSONDecodeError = json.JSONDecodeError
+
+_now = datetime.now
+
+def _now_iso() -> str:
+    """Current local time as an ISO-8601 string."""
+    return _now().isoformat()
+
+# UPDATE ... RETURNING needs SQLite 3.35+
+_SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Tool inputs are read-only once validated: frozen models reject assignment
+# and are hashable. One config is shared across the schemas below.
+_INPUT_CONFIG = ConfigDict(frozen=True)
 
 class MemoryInput(BaseModel):
     """Input schema for Memory tool."""
+    model_config = _INPUT_CONFIG
+
     key: str = Field(..., description="The key to store or retrieve the memory.")
     value: Optional[str] = Field(None, description="The value to store (if storing a memory).")
     context: Optional[str] = Field(None, description="Optional context about the memory for better retrieval.")
@@ -38,6 +74,13 @@ class Memory(BaseTool):
     )
     args_schema: Type[BaseModel] = MemoryInput
     memory_file: str = "agent_memory.json"
+    memory_db: str = "memory.db"
+    # Set in __init__; declared so pydantic accepts the assignments
+    memory_dir: str = "./memory"
+    mlflow_manager: Any = None
+
+    _conn: Optional[sqlite3.Connection] = PrivateAttr(default=None)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
 
     def __init__(self, memory_dir: str = "./memory", **kwargs):
         """
@@ -49,7 +92,7 @@ class Memory(BaseTool):
         """
         super().__init__(**kwargs)
         self.memory_dir = memory_dir
-        self.mlflow_manager = MLflowManager()
+        self.mlflow_manager = get_manager()
 
         # Ensure memory directory exists
         os.makedirs(self.memory_dir, exist_ok=True)
@@ -84,26 +127,20 @@ class Memory(BaseTool):
         Returns:
             A confirmation message
         """
-        # Load existing memories
-        memories = self._load_memories()
-
         # Create timestamp
-        timestamp = datetime.now().isoformat()
-
-        # Store the memory
-        memories[key] = {
-            "value": value,
-            "context": context,
-            "timestamp": timestamp,
-            "access_count": 0
-        }
+        timestamp = _now_iso()
 
-        # Save memories
-        self._save_memories(memories)
+        # Store (or overwrite) the memory
+        with self._lock:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO memories (key, value, context, timestamp, access_count, last_accessed) "
+                "VALUES (?, ?, ?, ?, 0, NULL)",
+                (key, value, context, timestamp)
+            )
 
         # Log to MLflow
-        with self.mlflow_manager.start_run(run_name="memory_operations"):
-            self.mlflow_manager.log_param(f"memory_store_{self._hash_key(key)}", timestamp)
+        with self.mlflow_manager.start_run(run_name="memory_operations", reuse_active=True):
+            self.mlflow_manager.log_batch(tags={f"memory_store_{self._hash_key(key)}": timestamp})
 
         return f"Memory stored successfully with key: {key}"
 
@@ -117,29 +154,88 @@ class Memory(BaseTool):
         Returns:
             The retrieved memory or a message indicating the memory wasn't found
         """
-        # Load existing memories
-        memories = self._load_memories()
+        last_accessed = _now_iso()
+
+        # Update access count and time, reading the value back in the same statement
+        with self._lock:
+            conn = self._connect()
+            if _SQLITE_HAS_RETURNING:
+                row = conn.execute(
+                    "UPDATE memories SET access_count = access_count + 1, last_accessed = ? "
+                    "WHERE key = ? RETURNING value, access_count",
+                    (last_accessed, key)
+                ).fetchone()
+            else:
+                conn.execute(
+                    "UPDATE memories SET access_count = access_count + 1, last_accessed = ? WHERE key = ?",
+                    (last_accessed, key)
+                )
+                row = conn.execute(
+                    "SELECT value, access_count FROM memories WHERE key = ?", (key,)
+                ).fetchone()
 
         # Check if the memory exists
-        if key in memories:
-            # Update access count and time
-            memories[key]["access_count"] += 1
-            memories[key]["last_accessed"] = datetime.now().isoformat()
-            self._save_memories(memories)
-
-            # Log to MLflow
-            with self.mlflow_manager.start_run(run_name="memory_operations"):
-                self.mlflow_manager.log_param(f"memory_retrieve_{self._hash_key(key)}", datetime.now().isoformat())
-                self.mlflow_manager.log_metric(f"memory_access_count_{self._hash_key(key)}", memories[key]["access_count"])
-
-            # Return the memory value
-            return memories[key]["value"]
-        else:
+        if row is None:
             return f"No memory found with key: {key}"
 
-    def _load_memories(self) -> Dict[str, Any]:
+        value, access_count = row
+
+        # Log to MLflow
+        key_hash = self._hash_key(key)
+        with self.mlflow_manager.start_run(run_name="memory_operations", reuse_active=True):
+            self.mlflow_manager.log_batch(
+                metrics={f"memory_access_count_{key_hash}": access_count},
+                tags={f"memory_retrieve_{key_hash}": last_accessed}
+            )
+
+        # Return the memory value
+        return value
+
+    def _connect(self) -> sqlite3.Connection:
         """
-        Load memories from the memory file.
+        Return the memory database connection, opening it on first use.
+
+        The caller must hold ``self._lock``.
+
+        Returns:
+            An autocommit SQLite connection in WAL mode
+        """
+        if self._conn is not None:
+            return self._conn
+
+        conn = sqlite3.connect(
+            os.path.join(self.memory_dir, self.memory_db),
+            isolation_level=None,
+            check_same_thread=False
+        )
+        # WAL lets concurrent agents read while one writes
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS memories ("
+            "key TEXT PRIMARY KEY, value TEXT, context TEXT, timestamp TEXT, "
+            "access_count INT, last_accessed TEXT)"
+        )
+
+        # First run against this directory: import the old JSON snapshot, if any
+        if conn.execute("SELECT 1 FROM memories LIMIT 1").fetchone() is None:
+            legacy = self._load_legacy_memories()
+            if legacy:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO memories VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (key, memory.get("value"), memory.get("context"), memory.get("timestamp"),
+                         memory.get("access_count", 0), memory.get("last_accessed"))
+                        for key, memory in legacy.items()
+                    ]
+                )
+
+        self._conn = conn
+        return conn
+
+    def _load_legacy_memories(self) -> Dict[str, Any]:
+        """
+        Load memories from the JSON snapshot written by earlier versions.
 
         Returns:
             Dictionary of memories
@@ -147,23 +243,12 @@ class Memory(BaseTool):
         memory_path = os.path.join(self.memory_dir, self.memory_file)
         if os.path.exists(memory_path):
             try:
-                with open(memory_path, 'r') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
+                with open(memory_path, 'rb') as f:
+                    return _json_loads(f.read())
+            except _JSONDecodeError:
                 return {}
         return {}
 
-    def _save_memories(self, memories: Dict[str, Any]) -> None:
-        """
-        Save memories to the memory file.
-
-        Args:
-            memories: Dictionary of memories to save
-        """
-        memory_path = os.path.join(self.memory_dir, self.memory_file)
-        with open(memory_path, 'w') as f:
-            json.dump(memories, f, indent=2)
-
     def _hash_key(self, key: str) -> str:
         """
         Hash a key for use in MLflow parameters (must be alphanumeric with limited special chars).
@@ -174,10 +259,16 @@ class Memory(BaseTool):
         Returns:
             A hashed representation of the key
         """
-        return base64.b32encode(hashlib.md5(key.encode()).digest()).decode().lower()[:8]
+        return hashlib.blake2b(key.encode(), digest_size=4).hexdigest()
+
+# Per-step templates for ChainedReasoning._format_reasoning
+_STEP = "### Step {}: {}\n{}\n\n"
+_STEP_WITH_CONFIDENCE = "### Step {}: {}\n{}\nConfidence: {:.2f}\n\n"
 
 class ReasoningInput(BaseModel):
     """Input schema for ChainedReasoning tool."""
+    model_config = _INPUT_CONFIG
+
     question: str = Field(..., description="The question or problem to reason about.")
     max_steps: int = Field(5, description="Maximum number of reasoning steps (default: 5, max: 10).")
     track_confidence: bool = Field(True, description="Whether to track confidence for each step.")
@@ -197,6 +288,7 @@ class ChainedReasoning(BaseTool):
         "sequential reasoning steps to arrive at a well-justified conclusion."
     )
     args_schema: Type[BaseModel] = ReasoningInput
+    mlflow_manager: Any = None  # Set in __init__
 
     def __init__(self, **kwargs):
         """
@@ -206,7 +298,7 @@ class ChainedReasoning(BaseTool):
             **kwargs: Additional arguments to pass to the BaseTool constructor
         """
         super().__init__(**kwargs)
-        self.mlflow_manager = MLflowManager()
+        self.mlflow_manager = get_manager()
 
     def _run(self, question: str, max_steps: int = 5, track_confidence: bool = True) -> str:
         """
@@ -246,23 +338,24 @@ class ChainedReasoning(BaseTool):
         # Format the output
         result = self._format_reasoning(reasoning, question)
 
-        # Log to MLflow
-        run_id = f"reasoning_{int(time.time())}"
-        with self.mlflow_manager.start_run(run_name=run_id):
-            self.mlflow_manager.log_param("question", question)
-            self.mlflow_manager.log_param("max_steps", max_steps)
-            self.mlflow_manager.log_param("track_confidence", track_confidence)
-
+        # Log to MLflow; calls can share the enclosing run, so key tags and artifacts per call
+        call_id = f"reasoning_{int(time.time())}_{token_hex(4)}"
+        with self.mlflow_manager.start_run(run_name=call_id, reuse_active=True):
+            metrics = {}
             if track_confidence:
-                avg_confidence = sum(step.get("confidence", 0) for step in reasoning) / len(reasoning)
-                self.mlflow_manager.log_metric("average_confidence", avg_confidence)
+                metrics["average_confidence"] = sum(step.get("confidence", 0) for step in reasoning) / len(reasoning)
+
+            self.mlflow_manager.log_batch(
+                metrics=metrics,
+                tags={
+                    f"{call_id}.question": question,
+                    f"{call_id}.max_steps": max_steps,
+                    f"{call_id}.track_confidence": track_confidence
+                }
+            )
 
             # Log the reasoning steps
-            reasoning_file = f"./mlflow-artifacts/reasoning_{run_id}.json"
-            os.makedirs(os.path.dirname(reasoning_file), exist_ok=True)
-            with open(reasoning_file, 'w') as f:
-                json.dump(reasoning, f, indent=2)
-            self.mlflow_manager.log_artifact(reasoning_file)
+            self.mlflow_manager.log_dict(reasoning, f"{call_id}.json")
 
         return result
 
@@ -277,24 +370,25 @@ class ChainedReasoning(BaseTool):
         Returns:
             Formatted reasoning output
         """
-        result = f"## Reasoning Process for: {question}\n\n"
+        parts = [f"## Reasoning Process for: {question}\n\n"]
 
         for step in reasoning:
-            result += f"### Step {step['step']}: {step['type'].capitalize()}\n"
-            result += f"{step['content']}\n"
             if step.get("confidence") is not None:
-                result += f"Confidence: {step['confidence']:.2f}\n"
-            result += "\n"
+                parts.append(_STEP_WITH_CONFIDENCE.format(
+                    step["step"], step["type"].capitalize(), step["content"], step["confidence"]
+                ))
+            else:
+                parts.append(_STEP.format(step["step"], step["type"].capitalize(), step["content"]))
 
         # Extract conclusion (last step)
-        conclusion = reasoning[-1]["content"]
+        parts.append(f"## Final Answer\n{reasoning[-1]['content']}\n")
 
-        result += f"## Final Answer\n{conclusion}\n"
-
-        return result
+        return "".join(parts)
 
 class FeedbackInput(BaseModel):
     """Input schema for Feedback tool."""
+    model_config = _INPUT_CONFIG
+
     task_id: str = Field(..., description="The ID of the task to provide feedback for.")
     rating: float = Field(..., description="Feedback rating between 0.0 (poor) and 1.0 (excellent).")
     comments: Optional[str] = Field(None, description="Optional feedback comments or suggestions.")
@@ -313,6 +407,8 @@ class Feedback(BaseTool):
         "Use this tool to rate the quality of completed tasks and offer suggestions."
     )
     args_schema: Type[BaseModel] = FeedbackInput
+    feedback_dir: str = "./feedback"
+    mlflow_manager: Any = None  # Set in __init__
 
     def __init__(self, **kwargs):
         """
@@ -322,7 +418,10 @@ class Feedback(BaseTool):
             **kwargs: Additional arguments to pass to the BaseTool constructor
         """
         super().__init__(**kwargs)
-        self.mlflow_manager = MLflowManager()
+        self.mlflow_manager = get_manager()
+
+        # Ensure feedback directory exists
+        os.makedirs(self.feedback_dir, exist_ok=True)
 
     def _run(self, task_id: str, rating: float, comments: Optional[str] = None) -> str:
         """
@@ -340,7 +439,7 @@ class Feedback(BaseTool):
         rating = min(max(0.0, rating), 1.0)
 
         # Record feedback timestamp
-        timestamp = datetime.now().isoformat()
+        timestamp = _now_iso()
 
         # Structure feedback data
         feedback_data = {
@@ -351,34 +450,32 @@ class Feedback(BaseTool):
         }
 
         # Save feedback to file
-        feedback_dir = "./feedback"
-        os.makedirs(feedback_dir, exist_ok=True)
-        feedback_file = os.path.join(feedback_dir, f"feedback_{task_id}.json")
-
-        with open(feedback_file, 'w') as f:
-            json.dump(feedback_data, f, indent=2)
+        feedback_file = os.path.join(self.feedback_dir, f"feedback_{task_id}.json")
 
-        # Log to MLflow
-        with self.mlflow_manager.start_run(run_name=f"task_{task_id}"):
-            self.mlflow_manager.log_metric("feedback_rating", rating)
-            self.mlflow_manager.log_param("feedback_timestamp", timestamp)
+        with open(feedback_file, 'wb') as f:
+            f.write(_json_dumps(feedback_data))
 
+        # Log to MLflow; calls can share the enclosing run, so key tags and artifacts per call
+        call_id = f"feedback_{task_id}_{token_hex(4)}"
+        with self.mlflow_manager.start_run(run_name=f"task_{task_id}", reuse_active=True):
+            tags = {f"{call_id}.timestamp": timestamp}
             if comments:
-                self.mlflow_manager.log_param("feedback_comments", comments[:250])  # Limit parameter length
+                tags[f"{call_id}.comments"] = comments[:250]  # Keep the tag short; full text is an artifact
 
+            self.mlflow_manager.log_batch(metrics={"feedback_rating": rating}, tags=tags)
+
+            if comments:
                 # Log full comments as artifact
-                comments_file = f"./mlflow-artifacts/feedback_{task_id}_comments.txt"
-                os.makedirs(os.path.dirname(comments_file), exist_ok=True)
-                with open(comments_file, 'w') as f:
-                    f.write(comments)
-                self.mlflow_manager.log_artifact(comments_file)
+                self.mlflow_manager.log_text(comments, f"{call_id}_comments.txt")
 
         return f"Feedback recorded successfully for task {task_id} with rating {rating:.2f}"
 
 class SagaOrchestratorInput(BaseModel):
     """Input for the distributed saga orchestrator."""
+    model_config = _INPUT_CONFIG
+
     saga_id: str = Field(..., description="Unique identifier for the saga transaction")
-    steps: list = Field(..., description="List of saga steps with compensating actions")
+    steps: List[Any] = Field(..., description="List of saga steps with compensating actions")
 
 class SagaOrchestrator(BaseTool):
     name: str = "saga_orchestrator"
@@ -394,9 +491,11 @@ class SagaOrchestrator(BaseTool):
 
 class EventStreamProcessorInput(BaseModel):
     """Input for the event stream processor."""
+    model_config = _INPUT_CONFIG
+
     stream_name: str = Field(..., description="Name of the event stream to process")
     handler_type: str = Field(..., description="Type of event handler to use")
-    filters: dict = Field(default={}, description="Filtering criteria for events")
+    filters: Dict[str, Any] = Field(default_factory=dict, description="Filtering criteria for events")
 
 class EventStreamProcessor(BaseTool):
     name: str = "event_stream_processor"
@@ -412,9 +511,11 @@ class EventStreamProcessor(BaseTool):
 
 class WorkflowTemplateInput(BaseModel):
     """Input for the workflow template manager."""
+    model_config = _INPUT_CONFIG
+
     template_name: str = Field(..., description="Name of the workflow template")
     project_type: str = Field(..., description="Type of project this template is for")
-    steps: list = Field(..., description="Workflow steps configuration")
+    steps: List[Any] = Field(..., description="Workflow steps configuration")
 
 class WorkflowTemplateManager(BaseTool):
     name: str = "workflow_template_manager"
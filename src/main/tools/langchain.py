@@ -3,29 +3,93 @@ LangChain Tool Integration for CrewAI
 This module provides integration with LangChain tools for CrewAI agents.
 """
 
-from typing import List, Dict, Any, Optional, Union, Type
-from pydantic import BaseModel, Field, create_model
+from typing import TYPE_CHECKING, Callable, List, Dict, Any, Optional, Type
+from pydantic import BaseModel, ConfigDict, Field, create_model
+import functools
 import inspect
 import logging
+import weakref
 from crewai.tools import BaseTool
-from langchain.tools import BaseTool as LangchainBaseTool
-from langchain.agents import Tool as LangchainTool
+
+if TYPE_CHECKING:
+    # Only needed for annotations; langchain.agents.Tool subclasses this
+    from langchain.tools import BaseTool as LangchainBaseTool
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# Signatures keyed by the underlying function; entries go away with the function
+_SIG_CACHE: "weakref.WeakKeyDictionary[Callable, inspect.Signature]" = weakref.WeakKeyDictionary()
+
+def _cached_signature(fn: Callable) -> inspect.Signature:
+    """
+    Return ``inspect.signature(fn)``, parsing each underlying function only once.
+
+    Bound methods are fresh objects on every attribute access, so they are cached
+    through ``__func__`` and the bound parameter is dropped afterwards.
+
+    Args:
+        fn: The function or bound method to inspect
+
+    Returns:
+        The signature of ``fn`` as ``inspect.signature`` would report it
+    """
+    func = getattr(fn, "__func__", fn)
+    try:
+        sig = _SIG_CACHE.get(func)
+        if sig is None:
+            sig = _SIG_CACHE[func] = inspect.signature(func)
+    except TypeError:
+        # Not weak-referenceable (e.g. some builtins): inspect it directly
+        return inspect.signature(fn)
+
+    if func is not fn:
+        sig = sig.replace(parameters=tuple(sig.parameters.values())[1:])
+    return sig
+
+class _GenericArgSchema(BaseModel):
+    """Minimal schema shared by every tool whose arguments can't be inferred."""
+    argument: str = Field(..., description="Argument for the tool")
+
+@functools.lru_cache(maxsize=512)
+def _build_args_schema(tool_cls: type, tool_name: str, params: tuple) -> Type[BaseModel]:
+    """
+    Build the arguments model for a LangChain tool from its signature.
+
+    Cached on (tool class, tool name, signature) so adapters wrapping the same
+    kind of tool share one schema class instead of calling ``create_model`` each time.
+
+    Args:
+        tool_cls: The LangChain tool's class
+        tool_name: The tool's name, used for the model name
+        params: Tuples of (name, annotation, default) for each parameter
+
+    Returns:
+        A Pydantic model class representing the tool's arguments
+    """
+    fields = {
+        param_name: (param_type, Field(default=default, description=f"Parameter {param_name}"))
+        for param_name, param_type, default in params
+    }
+    return create_model(f"{tool_name}Schema", **fields)
+
 class LangChainToolAdapter(BaseTool):
     """
     Adapter class to use LangChain tools within CrewAI.
     This adapter wraps LangChain tools and makes them compatible with CrewAI's tool interface.
     """
 
+    # The wrapped tool is stored as-is rather than validated field by field
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     name: str
     description: str
-    langchain_tool: Union[LangchainBaseTool, LangchainTool]
+    # Any rather than the LangChain types: the tool is never (de)serialized, so
+    # pydantic needn't build a validator around LangChain's own model schema
+    langchain_tool: Any = Field(..., exclude=True)
     args_schema: Optional[Type[BaseModel]] = None
 
-    def __init__(self, langchain_tool: Union[LangchainBaseTool, LangchainTool], **data):
+    def __init__(self, langchain_tool: "LangchainBaseTool", **data):
         """
         Initialize a LangChain tool adapter.
 
@@ -40,7 +104,21 @@ class LangChainToolAdapter(BaseTool):
             raise ValueError("Tool must have name and description")
 
         # Create a Pydantic model for the tool's arguments
-        args_schema = self._create_args_schema(langchain_tool)
+        args_schema = self._create_args_schema(langchain_tool, tool_name)
+
+        if not data:
+            # Every field comes from the wrapped tool, not from user input, so skip
+            # validation and adopt the state of an unvalidated instance (the same
+            # attributes pydantic's own __copy__ transfers)
+            constructed = self.model_construct(
+                name=tool_name,
+                description=tool_description,
+                langchain_tool=langchain_tool,
+                args_schema=args_schema
+            )
+            for attr in ("__dict__", "__pydantic_fields_set__", "__pydantic_extra__", "__pydantic_private__"):
+                object.__setattr__(self, attr, getattr(constructed, attr))
+            return
 
         # Initialize the CrewAI BaseTool with the LangChain tool's metadata
         super().__init__(
@@ -81,62 +159,54 @@ class LangChainToolAdapter(BaseTool):
             logger.error(f"Error running LangChain tool {self.name}: {str(e)}")
             return f"Error: {str(e)}"
 
-    def _create_args_schema(self, langchain_tool: Union[LangchainBaseTool, LangchainTool]) -> Type[BaseModel]:
+    def _create_args_schema(self, langchain_tool: "LangchainBaseTool", tool_name: str) -> Type[BaseModel]:
         """
         Create a Pydantic model for the tool's arguments based on the LangChain tool's schema.
 
         Args:
             langchain_tool: The LangChain tool
+            tool_name: The name of the tool (the adapter's fields are not set yet)
 
         Returns:
             A Pydantic model class representing the tool's arguments
         """
         # Try to get the arguments schema from the LangChain tool
-        if hasattr(langchain_tool, "args_schema") and langchain_tool.args_schema:
-            return langchain_tool.args_schema
+        schema = getattr(langchain_tool, "args_schema", None)
+        if schema:
+            return schema
 
         # If not available, try to infer from the function signature
-        tool_func = None
-        if hasattr(langchain_tool, "_run"):
-            tool_func = langchain_tool._run
-        elif hasattr(langchain_tool, "func"):
-            tool_func = langchain_tool.func
+        tool_func = getattr(langchain_tool, "_run", None) or getattr(langchain_tool, "func", None)
 
         if not tool_func:
-            # Create a minimal schema with a single text argument
-            return create_model(
-                f"{self.name}Schema",
-                argument=(str, Field(description=f"Argument for {self.name}"))
-            )
+            # Use the shared minimal schema with a single text argument
+            return _GenericArgSchema
 
         # Inspect the function signature to create a schema
         try:
-            sig = inspect.signature(tool_func)
-            fields = {}
-            for param_name, param in sig.parameters.items():
-                if param_name == "self":
-                    continue
-
-                # Try to determine the parameter type
-                param_type = param.annotation if param.annotation != inspect.Parameter.empty else str
-
-                # Set default value if available
-                default = ... if param.default == inspect.Parameter.empty else param.default
-
-                # Add to fields dictionary
-                fields[param_name] = (param_type, Field(default=default, description=f"Parameter {param_name}"))
+            sig = _cached_signature(tool_func)
+            params = tuple(
+                (
+                    param_name,
+                    # Try to determine the parameter type
+                    param.annotation if param.annotation != inspect.Parameter.empty else str,
+                    # Set default value if available
+                    ... if param.default == inspect.Parameter.empty else param.default
+                )
+                for param_name, param in sig.parameters.items()
+                if param_name != "self"
+            )
 
-            # Create and return the dynamic model
-            schema_class = create_model(f"{self.name}Schema", **fields)
-            return schema_class
+            try:
+                return _build_args_schema(type(langchain_tool), tool_name, params)
+            except TypeError:
+                # Unhashable annotation or default (e.g. a list): build without caching
+                return _build_args_schema.__wrapped__(type(langchain_tool), tool_name, params)
 
         except Exception as e:
-            logger.warning(f"Failed to create schema for {self.name}: {str(e)}")
+            logger.warning(f"Failed to create schema for {tool_name}: {str(e)}")
             # Fallback to minimal schema
-            return create_model(
-                f"{self.name}Schema",
-                argument=(str, Field(description=f"Argument for {self.name}"))
-            )
+            return _GenericArgSchema
 
 
 class LangChainToolRegistry:
@@ -147,9 +217,10 @@ class LangChainToolRegistry:
 
     def __init__(self):
         """Initialize the tool registry."""
-        self._tools = {}
+        # Registered adapters by name; read directly, mutate through register_tool(s)
+        self.tools: Dict[str, LangChainToolAdapter] = {}
 
-    def register_tool(self, langchain_tool: Union[LangchainBaseTool, LangchainTool], **kwargs) -> LangChainToolAdapter:
+    def register_tool(self, langchain_tool: "LangchainBaseTool", **kwargs) -> LangChainToolAdapter:
         """
         Register a LangChain tool and convert it to a CrewAI-compatible tool.
 
@@ -168,11 +239,11 @@ class LangChainToolRegistry:
         adapter = LangChainToolAdapter(langchain_tool, **kwargs)
 
         # Register the tool
-        self._tools[tool_name] = adapter
+        self.tools[tool_name] = adapter
 
         return adapter
 
-    def register_tools(self, langchain_tools: List[Union[LangchainBaseTool, LangchainTool]]) -> List[LangChainToolAdapter]:
+    def register_tools(self, langchain_tools: List["LangchainBaseTool"]) -> List[LangChainToolAdapter]:
         """
         Register multiple LangChain tools at once.
 
@@ -182,10 +253,11 @@ class LangChainToolRegistry:
         Returns:
             List of registered tool adapters
         """
-        adapters = []
-        for tool in langchain_tools:
-            adapter = self.register_tool(tool)
-            adapters.append(adapter)
+        adapter_cls = LangChainToolAdapter
+        adapters = [adapter_cls(tool) for tool in langchain_tools]
+
+        # Register them all at once; nothing is registered if any tool is invalid
+        self.tools.update((adapter.name, adapter) for adapter in adapters)
         return adapters
 
     def get_tool(self, name: str) -> Optional[LangChainToolAdapter]:
@@ -198,7 +270,7 @@ class LangChainToolRegistry:
         Returns:
             The tool adapter if found, None otherwise
         """
-        return self._tools.get(name)
+        return self.tools.get(name)
 
     def list_tools(self) -> List[LangChainToolAdapter]:
         """
@@ -207,17 +279,17 @@ class LangChainToolRegistry:
         Returns:
             List of all registered tool adapters
         """
-        return list(self._tools.values())
+        return list(self.tools.values())
 
     def clear(self) -> None:
         """Clear all registered tools."""
-        self._tools.clear()
+        self.tools.clear()
 
 
 # Global instance of the registry
 registry = LangChainToolRegistry()
 
-def adapt_langchain_tool(langchain_tool: Union[LangchainBaseTool, LangchainTool], **kwargs) -> LangChainToolAdapter:
+def adapt_langchain_tool(langchain_tool: "LangchainBaseTool", **kwargs) -> LangChainToolAdapter:
     """
     Convert a LangChain tool to a CrewAI-compatible tool.
 
@@ -230,7 +302,7 @@ def adapt_langchain_tool(langchain_tool: Union[LangchainBaseTool, LangchainTool]
     """
     return LangChainToolAdapter(langchain_tool, **kwargs)
 
-def adapt_langchain_tools(langchain_tools: List[Union[LangchainBaseTool, LangchainTool]]) -> List[LangChainToolAdapter]:
+def adapt_langchain_tools(langchain_tools: List["LangchainBaseTool"]) -> List[LangChainToolAdapter]:
     """
     Convert multiple LangChain tools to CrewAI-compatible tools.
 
@@ -240,7 +312,8 @@ def adapt_langchain_tools(langchain_tools: List[Union[LangchainBaseTool, Langcha
     Returns:
         List of CrewAI-compatible tool adapters
     """
-    return [adapt_langchain_tool(tool) for tool in langchain_tools]
+    adapter_cls = LangChainToolAdapter
+    return [adapter_cls(tool) for tool in langchain_tools]
 
 # Example usage:
 # from langchain.tools import BaseTool as LangchainBaseTool
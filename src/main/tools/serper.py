@@ -4,17 +4,97 @@ This module provides web search capabilities for CrewAI agents using the Serper
 """
 
 import os
-import json
-import requests
-from typing import Type, Dict, Any, List, Optional
-from pydantic import BaseModel, Field
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Annotated, ClassVar, Type, Dict, Any, Optional, Union
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, PrivateAttr
 from crewai.tools import BaseTool
 
+try:
+    import orjson
+
+    def _json_loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    _JSONDecodeError = orjson.JSONDecodeError
+except ImportError:
+    import json
+
+    def _json_loads(data: bytes) -> Any:
+        return json.loads(data)
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    _JSONDecodeError = json.JSONDecodeError
+
+try:
+    import ijson
+    _IJSON_ERRORS = (ijson.JSONError,)
+except ImportError:
+    ijson = None
+    _IJSON_ERRORS = ()
+
+class SearchType(Enum):
+    SEARCH = "search"
+    IMAGES = "images"
+    NEWS = "news"
+    PLACES = "places"
+
+# Per search type: the response key holding the results, the template for one
+# result (filled with its 1-based index, then the fields in order) and the
+# (field, default) pairs read from each result
+_RESULT_FORMATS = {
+    SearchType.SEARCH: (
+        "organic",
+        "{}. {}\n   URL: {}\n   {}\n\n",
+        (("title", "No Title"), ("link", "No Link"), ("snippet", "No Snippet")),
+    ),
+    SearchType.NEWS: (
+        "news",
+        "{}. {}\n   Source: {} | Date: {}\n   URL: {}\n   {}\n\n",
+        (("title", "No Title"), ("source", "Unknown Source"), ("date", "No Date"),
+         ("link", "No Link"), ("snippet", "No Snippet")),
+    ),
+    SearchType.PLACES: (
+        "places",
+        "{}. {}\n   Address: {}\n   Phone: {}\n   Rating: {} ({} reviews)\n\n",
+        (("name", "No Name"), ("address", "No Address"), ("phoneNumber", "No Phone"),
+         ("rating", "No Rating"), ("reviews", "No Reviews")),
+    ),
+    SearchType.IMAGES: (
+        "images",
+        "{}. {}\n   Image URL: {}\n   Source: {}\n\n",
+        (("title", "No Title"), ("imageUrl", "No Image URL"), ("source", "No Source")),
+    ),
+}
+
+# Split each spec's (field, default) pairs into parallel tuples so a result is
+# read with a single map() over its .get rather than a per-field Python loop
+_RESULT_LAYOUTS = {
+    search_type: (results_key, template, tuple(key for key, _ in fields), tuple(default for _, default in fields))
+    for search_type, (results_key, template, fields) in _RESULT_FORMATS.items()
+}
+
+# Search inputs are read-only once validated; extra keys from the agent are dropped,
+# and the schema is only built on first use
+_INPUT_CONFIG = ConfigDict(frozen=True, extra="ignore", defer_build=True)
+
+# Result counts are clamped to what Serper accepts while the arguments are validated
+_NumResults = Annotated[int, AfterValidator(lambda n: min(max(1, n), 100))]
+
 class SerperSearchInput(BaseModel):
     """Input schema for SerperSearch tool."""
+    model_config = _INPUT_CONFIG
+
     query: str = Field(..., description="The search query to execute.")
-    search_type: str = Field("search", description="The type of search to perform: 'search', 'images', 'news', or 'places'.")
-    num_results: int = Field(10, description="The number of search results to return (default: 10, max: 100).")
+    search_type: SearchType = Field(SearchType.SEARCH, description="The type of search to perform: 'search', 'images', 'news', or 'places'.")
+    num_results: _NumResults = Field(10, description="The number of search results to return (default: 10, max: 100).")
     country_code: Optional[str] = Field(None, description="The country code for localized results (e.g., 'us', 'uk', 'fr').")
 
 class SerperSearch(BaseTool):
@@ -34,6 +114,30 @@ class SerperSearch(BaseTool):
     args_schema: Type[BaseModel] = SerperSearchInput
     api_key: str = None
 
+    # Endpoint per supported search type
+    _URLS: ClassVar[Dict[SearchType, str]] = {
+        search_type: f"https://google.serper.dev/{search_type.value}" for search_type in SearchType
+    }
+    # Seconds to wait for Serper before giving up on a request
+    _TIMEOUT: ClassVar[int] = 30
+    _INVALID_TYPE_MSG: ClassVar[str] = (
+        "Error: Invalid search type '{}'. Valid options are: "
+        + ", ".join(member.value for member in SearchType)
+    )
+    # Large news/image responses are parsed while they download (needs ijson)
+    _STREAM_TYPES: ClassVar[frozenset] = frozenset({SearchType.NEWS, SearchType.IMAGES})
+    _STREAM_MIN_RESULTS: ClassVar[int] = 50
+    # Repeated identical queries within this many seconds are answered from memory
+    _CACHE_TTL: ClassVar[float] = 300.0
+    _CACHE_SIZE: ClassVar[int] = 128
+
+    # One requests.Session per calling thread, created on first use; sessions
+    # aren't safe to share between threads
+    _sessions: threading.local = PrivateAttr(default_factory=threading.local)
+    # (query, search_type, num_results, country_code) -> (stored_at, formatted results), oldest first
+    _cache: OrderedDict = PrivateAttr(default_factory=OrderedDict)
+    _cache_lock: Any = PrivateAttr(default_factory=threading.Lock)
+
     def __init__(self, api_key: str = None, **kwargs):
         """
         Initialize the SerperSearch tool.
@@ -52,7 +156,7 @@ class SerperSearch(BaseTool):
                 "set the SERPER_API_KEY environment variable."
             )
 
-    def _run(self, query: str, search_type: str = "search",
+    def _run(self, query: str, search_type: Union[SearchType, str] = SearchType.SEARCH,
              num_results: int = 10, country_code: Optional[str] = None) -> str:
         """
         Execute a search query using the Serper API.
@@ -60,22 +164,33 @@ class SerperSearch(BaseTool):
         Args:
             query: The search query to execute.
             search_type: The type of search to perform ('search', 'images', 'news', or 'places').
-            num_results: The number of search results to return.
+            num_results: The number of search results to return (clamped to 1-100 by the input schema).
             country_code: The country code for localized results.
 
         Returns:
             A formatted string containing the search results.
         """
-        # Validate search type
-        valid_search_types = ["search", "images", "news", "places"]
-        if search_type not in valid_search_types:
-            return f"Error: Invalid search type '{search_type}'. Valid options are: {', '.join(valid_search_types)}"
+        from requests.exceptions import RequestException
+        # Reading a streamed body goes straight to urllib3, whose errors requests doesn't wrap
+        from urllib3.exceptions import HTTPError as Urllib3HTTPError
 
-        # Limit number of results
-        num_results = min(max(1, num_results), 100)
-
-        # Set up the API request
-        url = f"https://google.serper.dev/search"
+        # Validate search type
+        try:
+            search_type = SearchType(search_type)
+        except ValueError:
+            return self._INVALID_TYPE_MSG.format(search_type)
+        url = self._URLS[search_type]
+
+        # Serve repeats of a recent identical query without another request
+        cache_key = (query, search_type, num_results, country_code)
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                stored_at, formatted_results = cached
+                if time.monotonic() - stored_at < self._CACHE_TTL:
+                    self._cache.move_to_end(cache_key)
+                    return formatted_results
+                del self._cache[cache_key]
 
         # Prepare payload based on search type
         payload = {
@@ -83,34 +198,63 @@ class SerperSearch(BaseTool):
             "num": num_results
         }
 
-        if search_type != "search":
-            url = f"https://google.serper.dev/{search_type}"
-
         if country_code:
             payload["gl"] = country_code
 
-        headers = {
-            "X-API-KEY": self.api_key,
-            "Content-Type": "application/json"
-        }
-
         try:
             # Make the API request
-            response = requests.post(url, headers=headers, data=json.dumps(payload))
-            response.raise_for_status()  # Raise exception for HTTP errors
-
-            # Parse response
-            search_results = response.json()
-
-            # Process and format results based on search type
-            formatted_results = self._format_results(search_results, search_type)
+            stream = (
+                ijson is not None
+                and search_type in self._STREAM_TYPES
+                and num_results >= self._STREAM_MIN_RESULTS
+            )
+            with self._get_session().post(url, data=_json_dumps(payload), timeout=self._TIMEOUT, stream=stream) as response:
+                response.raise_for_status()  # Raise exception for HTTP errors
+
+                if stream:
+                    # Feed result items to the formatter as they are parsed off the socket
+                    response.raw.decode_content = True
+                    results_key = _RESULT_LAYOUTS[search_type][0]
+                    search_results = {results_key: ijson.items(response.raw, f"{results_key}.item")}
+                else:
+                    # Parse response
+                    search_results = _json_loads(response.content)
+
+                # Process and format results based on search type
+                formatted_results = self._format_results(search_results, search_type)
+
+            with self._cache_lock:
+                self._cache[cache_key] = (time.monotonic(), formatted_results)
+                self._cache.move_to_end(cache_key)
+                if len(self._cache) > self._CACHE_SIZE:
+                    self._cache.popitem(last=False)
 
             return formatted_results
 
-        except requests.exceptions.RequestException as e:
+        except (RequestException, Urllib3HTTPError) as e:
             return f"Search error: {str(e)}"
+        except (_JSONDecodeError, *_IJSON_ERRORS) as e:
+            return f"Search error: invalid response from Serper ({str(e)})"
+
+    def _get_session(self):
+        """
+        Return the calling thread's pooled session, creating it on first use.
 
-    def _format_results(self, search_results: Dict[str, Any], search_type: str) -> str:
+        Each thread reuses its own TLS connection across searches, so the tool
+        can be shared by agents running in parallel.
+        """
+        session = getattr(self._sessions, "session", None)
+        if session is None:
+            import requests
+
+            session = self._sessions.session = requests.Session()
+            session.headers.update({
+                "X-API-KEY": self.api_key,
+                "Content-Type": "application/json"
+            })
+        return session
+
+    def _format_results(self, search_results: Dict[str, Any], search_type: SearchType) -> str:
         """
         Format the search results as a readable string.
 
@@ -121,67 +265,33 @@ class SerperSearch(BaseTool):
         Returns:
             A formatted string representation of the search results.
         """
-        formatted = f"Search Results:\n\n"
-
-        if search_type == "search":
-            # For standard search
-            organic_results = search_results.get("organic", [])
-            for i, result in enumerate(organic_results, 1):
-                title = result.get("title", "No Title")
-                link = result.get("link", "No Link")
-                snippet = result.get("snippet", "No Snippet")
-                formatted += f"{i}. {title}\n   URL: {link}\n   {snippet}\n\n"
-
-            # Add knowledge graph if available
-            if "knowledgeGraph" in search_results:
-                kg = search_results["knowledgeGraph"]
-                formatted += "Knowledge Graph:\n"
-                formatted += f"  Title: {kg.get('title', 'N/A')}\n"
-                formatted += f"  Type: {kg.get('type', 'N/A')}\n"
-                if "description" in kg:
-                    formatted += f"  Description: {kg['description']}\n"
-                formatted += "\n"
-
-        elif search_type == "news":
-            # For news search
-            news_results = search_results.get("news", [])
-            for i, result in enumerate(news_results, 1):
-                title = result.get("title", "No Title")
-                link = result.get("link", "No Link")
-                date = result.get("date", "No Date")
-                source = result.get("source", "Unknown Source")
-                snippet = result.get("snippet", "No Snippet")
-                formatted += f"{i}. {title}\n   Source: {source} | Date: {date}\n   URL: {link}\n   {snippet}\n\n"
-
-        elif search_type == "places":
-            # For places search
-            places_results = search_results.get("places", [])
-            for i, result in enumerate(places_results, 1):
-                name = result.get("name", "No Name")
-                address = result.get("address", "No Address")
-                phone = result.get("phoneNumber", "No Phone")
-                rating = result.get("rating", "No Rating")
-                reviews = result.get("reviews", "No Reviews")
-                formatted += f"{i}. {name}\n   Address: {address}\n   Phone: {phone}\n   Rating: {rating} ({reviews} reviews)\n\n"
-
-        elif search_type == "images":
-            # For image search
-            images_results = search_results.get("images", [])
-            for i, result in enumerate(images_results, 1):
-                title = result.get("title", "No Title")
-                link = result.get("imageUrl", "No Image URL")
-                source_url = result.get("source", "No Source")
-                formatted += f"{i}. {title}\n   Image URL: {link}\n   Source: {source_url}\n\n"
-
-        if not formatted.strip().endswith("Search Results:"):
-            return formatted
-        else:
+        parts = ["Search Results:\n\n"]
+        append = parts.append
+
+        results_key, template, keys, defaults = _RESULT_LAYOUTS[search_type]
+        render = template.format
+        for i, result in enumerate(search_results.get(results_key, ()), 1):
+            append(render(i, *map(result.get, keys, defaults)))
+
+        # Add knowledge graph if available (standard search only)
+        if search_type is SearchType.SEARCH and "knowledgeGraph" in search_results:
+            kg = search_results["knowledgeGraph"]
+            description = f"  Description: {kg['description']}\n" if "description" in kg else ""
+            append(
+                f"Knowledge Graph:\n  Title: {kg.get('title', 'N/A')}\n"
+                f"  Type: {kg.get('type', 'N/A')}\n{description}\n"
+            )
+
+        if len(parts) == 1:
             return "No results found."
+        return "".join(parts)
 
 class SerperNewsInput(BaseModel):
     """Input schema for SerperNews tool."""
+    model_config = _INPUT_CONFIG
+
     query: str = Field(..., description="The news search query to execute.")
-    num_results: int = Field(5, description="The number of news results to return (default: 5, max: 100).")
+    num_results: _NumResults = Field(5, description="The number of news results to return (default: 5, max: 100).")
     country_code: Optional[str] = Field(None, description="The country code for localized results (e.g., 'us', 'uk', 'fr').")
 
 class SerperNews(SerperSearch):
@@ -196,4 +306,4 @@ class SerperNews(SerperSearch):
 
     def _run(self, query: str, num_results: int = 5, country_code: Optional[str] = None) -> str:
         """Execute a news search query using the Serper API."""
-        return super()._run(query=query, search_type="news", num_results=num_results, country_code=country_code)
+        return super()._run(query=query, search_type=SearchType.NEWS, num_results=num_results, country_code=country_code)
@@ -1,13 +1,32 @@
 # File: src/main/tools/task.py
+import atexit
+import heapq
+import itertools
+import logging
+import queue
+import threading
 import time
-import uuid
 import os
+from collections import defaultdict
+from dataclasses import dataclass, field, asdict
+from secrets import token_hex
 from typing import Dict, List, Optional, Any, Union
 from datetime import datetime
 from enum import Enum
-import json
-import mlflow
-from ..utils.mlflow_manager import MLflowManager
+from ..utils.mlflow_manager import get_manager
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    import json
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode()
 
 # Enums
 class Priority(Enum):
@@ -30,14 +49,153 @@ class ApprovalRole(Enum):
     AGENT = "AGENT"
     MANAGER = "MANAGER"
 
+# Enum values resolved once; tasks store these plain strings
+_STATUS_PENDING = Status.PENDING.value
+_STATUS_IN_PROGRESS = Status.IN_PROGRESS.value
+_STATUS_COMPLETED = Status.COMPLETED.value
+_STATUS_FAILED = Status.FAILED.value
+_TASK_STATUSES = (_STATUS_PENDING, _STATUS_IN_PROGRESS, _STATUS_COMPLETED, _STATUS_FAILED)
+_EVENT_COMPLETED = Event.COMPLETED.value
+_EVENT_FAILED = Event.FAILED.value
+_EVENT_VALUES = [event.value for event in Event]
+_ROLE_AUTO = ApprovalRole.AUTO.value
+_ROLE_AGENT = ApprovalRole.AGENT.value
+
+# Progress table pieces
+_PROGRESS_HEADER = (
+    "Progress Status:\n"
+    "| Task ID | Title | Description | Status | Approval |\n"
+    "|----------|----------|------|------|----------|\n"
+)
+_STATUS_EMOJI = {
+    _STATUS_PENDING: "⏳ Pending",
+    _STATUS_IN_PROGRESS: "🔄 In Progress",
+    _STATUS_COMPLETED: "✅ Completed",
+    _STATUS_FAILED: "❌ Failed"
+}
+
+# Heap sort key per priority (negated weight, so the highest pops first);
+# unknown priorities sort last along with tasks that have no due date
+_PRIORITY_SORT_KEY = {
+    Priority.HIGH.value: -3,
+    Priority.MEDIUM.value: -2,
+    Priority.LOW.value: -1
+}
+_NO_DUE_DATE = "9999-12-31"
+
+# Records kept for each request, task and subtask; asdict() them wherever they leave the tool
+@dataclass(slots=True)
+class RequestRecord:
+    """A planned user request and the IDs of its tasks."""
+    id: str
+    original_request: str
+    split_details: Optional[str]
+    priority: str
+    due_date: Optional[str]
+    created_at: str
+    status: str = _STATUS_PENDING
+    tasks: List[str] = field(default_factory=list)
+    completed_at: Optional[str] = None
+    execution_time: float = 0.0
+
+@dataclass(slots=True)
+class TaskRecord:
+    """A task of a request, with its completion and approval state."""
+    id: str
+    request_id: str
+    title: str
+    description: str
+    priority: str
+    due_date: Optional[str]
+    created_at: str
+    status: str = _STATUS_PENDING
+    subtasks: List[str] = field(default_factory=list)
+    completed_at: Optional[str] = None
+    completed_details: Optional[str] = None
+    execution_time: float = 0.0
+    failed_at: Optional[str] = None
+    failure_details: Optional[str] = None
+    approved: bool = False
+    approved_at: Optional[str] = None
+    approval_role: Optional[str] = None
+    confidence_score: Optional[float] = None
+
+@dataclass(slots=True)
+class SubtaskRecord:
+    """A subtask of a task, with its completion and approval state."""
+    id: str
+    task_id: str
+    request_id: str
+    title: str
+    description: str
+    priority: str
+    due_date: Optional[str]
+    created_at: str
+    status: str = _STATUS_PENDING
+    completed_at: Optional[str] = None
+    completed_details: Optional[str] = None
+    execution_time: float = 0.0
+    failed_at: Optional[str] = None
+    failure_details: Optional[str] = None
+    approved: bool = False
+    approved_at: Optional[str] = None
+    approval_role: Optional[str] = None
+    confidence_score: Optional[float] = None
+
+# Per-request limits of MLflow's log_batch API; merged batches stay within them
+_MAX_BATCH_METRICS = 1000
+_MAX_BATCH_PARAMS_AND_TAGS = 100
+# How long the MLflow worker keeps collecting writes after the first one arrives,
+# and the most it takes in one go
+_MLFLOW_FLUSH_WINDOW = 0.1
+_MLFLOW_FLUSH_MAX_CALLS = 500
+# How long interpreter exit waits for queued MLflow writes before dropping them
+_MLFLOW_EXIT_TIMEOUT = 10.0
+
 class TaskMasterTools:
     """Implementation of the TaskMaster tools with MLflow integration."""
 
+    # MLflow writes are queued and sent by a background worker, which merges
+    # consecutive batches for the same run into one log_batch request. All
+    # instances share the queue and the worker, started with the first instance
+    _mlflow_queue = queue.Queue()
+    _mlflow_worker = None
+    _mlflow_worker_lock = threading.Lock()
+
     def __init__(self):
-        self.mlflow_manager = MLflowManager()
+        self.mlflow_manager = get_manager()
         self.requests = {}
         self.tasks = {}
         self.subtasks = {}
+        # One long-lived MLflow run per request, logged to by ID: request_id -> run_id.
+        # Finished requests keep their entry, so late writes reach the ended run
+        self._request_runs = {}
+        self._finished_runs = set()
+        # Per-request scheduling state: a heap of pending tasks (entries go stale
+        # rather than being removed) and the IDs of its tasks bucketed by status
+        self._pending_heaps = {}
+        self._tasks_by_status = {}
+        # IDs of each request's approved tasks, and of those auto-approved;
+        # approved tasks can't be deleted
+        self._approved_tasks = {}
+        self._auto_approved_tasks = {}
+        # Running [sum, count] of each request's positive task execution times
+        self._task_time_totals = {}
+        # Task counts by status across all requests, for the context metrics
+        self._status_counts = defaultdict(int)
+        # Creation order of each task, the tie-breaker between equal priorities/due dates,
+        # and the key of each task's live heap entry (any other entry for it is stale)
+        self._task_order = {}
+        self._schedule_keys = {}
+        self._task_seq = itertools.count()
+        # Rendered progress table per request and rendered row per task; a change to
+        # a task drops its row and its request's table, and only that row is redone
+        self._progress_cache = {}
+        self._progress_rows = {}
+        # Local staging directory for artifact files, created once up front
+        self.artifact_dir = "./mlflow-artifacts"
+        os.makedirs(self.artifact_dir, exist_ok=True)
+        self._start_mlflow_worker()
         # Configuration for auto-approval
         self.auto_decision_threshold = 0.75
         # Error handling settings
@@ -50,61 +208,68 @@ class TaskMasterTools:
                          priority: str = "MEDIUM",
                          due_date: str = None) -> Dict:
         """Register a new user request and plan its associated tasks."""
-        request_id = f"req-{str(uuid.uuid4())[:8]}"
+        request_id = f"req-{token_hex(4)}"
         timestamp = datetime.now().isoformat()
 
         # Create request object
-        request = {
-            "id": request_id,
-            "original_request": original_request,
-            "split_details": split_details,
-            "priority": priority,
-            "due_date": due_date,
-            "created_at": timestamp,
-            "status": Status.PENDING.value,
-            "tasks": []
-        }
+        request = RequestRecord(
+            id=request_id,
+            original_request=original_request,
+            split_details=split_details,
+            priority=priority,
+            due_date=due_date,
+            created_at=timestamp
+        )
+
+        self._pending_heaps[request_id] = []
+        self._tasks_by_status[request_id] = defaultdict(set)
+        self._approved_tasks[request_id] = set()
+        self._auto_approved_tasks[request_id] = set()
+        self._task_time_totals[request_id] = [0.0, 0]
 
         # Create tasks
+        new_tasks = []
         for task_data in tasks:
-            task_id = f"task-{str(uuid.uuid4())[:8]}"
-            task = {
-                "id": task_id,
-                "request_id": request_id,
-                "title": task_data["title"],
-                "description": task_data["description"],
-                "priority": priority,
-                "due_date": due_date,
-                "created_at": timestamp,
-                "status": Status.PENDING.value,
-                "subtasks": []
-            }
+            task_id = f"task-{token_hex(4)}"
+            task = TaskRecord(
+                id=task_id,
+                request_id=request_id,
+                title=task_data["title"],
+                description=task_data["description"],
+                priority=priority,
+                due_date=due_date,
+                created_at=timestamp
+            )
             self.tasks[task_id] = task
-            request["tasks"].append(task_id)
+            request.tasks.append(task_id)
+            new_tasks.append(task)
+            self._track_new_task(task)
 
         self.requests[request_id] = request
 
         # Log to MLflow
-        with self.mlflow_manager.start_run(run_name=request_id):
-            self.mlflow_manager.log_param("request_id", request_id)
-            self.mlflow_manager.log_param("original_request", original_request)
-            self.mlflow_manager.log_param("num_tasks", len(tasks))
-            self.mlflow_manager.log_param("priority", priority)
-            if due_date:
-                self.mlflow_manager.log_param("due_date", due_date)
+        run_id = self._request_run_id(request_id)
+        params = {
+            "request_id": request_id,
+            "original_request": original_request,
+            "num_tasks": len(tasks),
+            "priority": priority
+        }
+        if due_date:
+            params["due_date"] = due_date
+        self._queue_batch(run_id=run_id, params=params)
 
-            # Save request to file for tracking
-            request_file = f"./mlflow-artifacts/request_{request_id}.json"
-            os.makedirs(os.path.dirname(request_file), exist_ok=True)
-            with open(request_file, 'w') as f:
-                json.dump(request, f, indent=2)
-            self.mlflow_manager.log_artifact(request_file)
+        # Save request to file for tracking
+        request_file = f"{self.artifact_dir}/request_{request_id}.json"
+        with open(request_file, 'wb') as f:
+            f.write(_json_dumps(asdict(request)))
+        self._queue_call(self.mlflow_manager.log_artifact, request_file, run_id=run_id)
 
         return {
             "status": "planned",
             "requestId": request_id,
             "totalTasks": len(tasks),
-            "tasks": [self._get_task_summary(task_id) for task_id in request["tasks"]],
+            "tasks": list(map(self._get_task_summary, new_tasks)),
             "message": f"Tasks have been successfully added. Please use 'get_next_task' to retrieve the first task.\n\n{self._generate_progress_table(request_id)}"
         }
 
@@ -114,74 +279,51 @@ class TaskMasterTools:
             raise ValueError(f"Request ID {request_id} not found")
 
         request = self.requests[request_id]
+        tasks_by_status = self._tasks_by_status[request_id]
 
         # Check if all tasks are completed
-        all_completed = True
-        for task_id in request["tasks"]:
-            task = self.tasks[task_id]
-            if task["status"] != Status.COMPLETED.value:
-                all_completed = False
-                break
-
-        if all_completed:
+        if len(tasks_by_status[_STATUS_COMPLETED]) == len(request.tasks):
             return {
                 "status": "all_tasks_done",
                 "message": f"All tasks for request {request_id} have been completed. Please use 'approve_request_completion' to finalize.\n\n{self._generate_progress_table(request_id)}"
             }
 
-        # Find pending tasks
-        pending_tasks = []
-        for task_id in request["tasks"]:
-            task = self.tasks[task_id]
-            if task["status"] == Status.PENDING.value:
-                pending_tasks.append(task)
-
-        # Sort tasks by priority
-        priority_values = {
-            Priority.HIGH.value: 3,
-            Priority.MEDIUM.value: 2,
-            Priority.LOW.value: 1
-        }
-
-        if pending_tasks:
-            # Sort by priority and due date
-            pending_tasks.sort(
-                key=lambda t: (
-                    -priority_values.get(t["priority"], 0),
-                    t["due_date"] or "9999-12-31"
-                )
-            )
+        # Pop the most urgent pending task (by priority, then due date), skipping
+        # entries left behind by deletes, status changes and updates
+        pending_heap = self._pending_heaps[request_id]
+        next_task = None
+        while pending_heap:
+            entry = heapq.heappop(pending_heap)
+            task = self.tasks.get(entry[-1])
+            if task is not None and task.status == _STATUS_PENDING and entry is self._schedule_keys[task.id]:
+                next_task = task
+                break
 
-            next_task = pending_tasks[0]
-            next_task["status"] = Status.IN_PROGRESS.value
-            self.tasks[next_task["id"]] = next_task
+        if next_task is not None:
+            self._set_task_status(next_task, _STATUS_IN_PROGRESS)
 
             # Log to MLflow
-            with self.mlflow_manager.start_run(run_name=request_id):
-                self.mlflow_manager.log_param(f"task_{next_task['id']}_started_at", datetime.now().isoformat())
-
-                # Track context metrics for RL model
-                context_metrics = self._get_context_metrics()
-                for metric_name, value in context_metrics.items():
-                    self.mlflow_manager.log_metric(f"context.{metric_name}", value)
+            run_id = self._request_run_id(request_id)
+            # Track context metrics for RL model alongside the start time
+            context_metrics = self._get_context_metrics()
+            self._queue_batch(
+                run_id=run_id,
+                metrics={f"context.{metric_name}": value for metric_name, value in context_metrics.items()},
+                tags={f"task_{next_task.id}_started_at": datetime.now().isoformat()}
+            )
 
             return {
                 "status": "next_task",
-                "task": self._get_task_summary(next_task["id"]),
+                "task": self._get_task_summary(next_task),
                 "message": f"Next task is ready. Task approval will be required after completion.\n\n{self._generate_progress_table(request_id)}"
             }
 
         # If there are no pending tasks but some are in progress
-        in_progress_tasks = []
-        for task_id in request["tasks"]:
-            task = self.tasks[task_id]
-            if task["status"] == Status.IN_PROGRESS.value:
-                in_progress_tasks.append(task)
-
-        if in_progress_tasks:
+        in_progress_count = len(tasks_by_status[_STATUS_IN_PROGRESS])
+        if in_progress_count:
             return {
                 "status": "tasks_in_progress",
-                "message": f"There are {len(in_progress_tasks)} tasks in progress. Please await their completion or use 'mark_task_done'.\n\n{self._generate_progress_table(request_id)}"
+                "message": f"There are {in_progress_count} tasks in progress. Please await their completion or use 'mark_task_done'.\n\n{self._generate_progress_table(request_id)}"
             }
 
         # Fallback - should not reach here
@@ -192,7 +334,7 @@ class TaskMasterTools:
 
     def mark_task_done(self, request_id: str, task_id: str,
                        subtask_id: str = None,
-                       status: str = Status.COMPLETED.value,
+                       status: str = _STATUS_COMPLETED,
                        completed_details: str = None) -> Dict:
         """Mark a task or subtask as completed."""
         if request_id not in self.requests:
@@ -209,25 +351,21 @@ class TaskMasterTools:
                 raise ValueError(f"Subtask ID {subtask_id} not found")
 
             subtask = self.subtasks[subtask_id]
-            subtask["status"] = status
-            subtask["completed_at"] = datetime.now().isoformat()
-            subtask["completed_details"] = completed_details
+            subtask.status = status
+            self._mark_completed(subtask, datetime.now())
+            subtask.completed_details = completed_details
 
             # Log subtask completion metrics
-            with self.mlflow_manager.start_run(run_name=request_id):
-                execution_time = self._calculate_execution_time(subtask)
+            run_id = self._request_run_id(request_id)
+            execution_time = self._calculate_execution_time(subtask)
 
-                self.mlflow_manager.log_task_metrics(f"{task_id}.{subtask_id}", {
-                    "execution_time": execution_time,
-                    "status": 1.0 if status == Status.COMPLETED.value else 0.0
-                })
+            self._queue_task_metrics(f"{task_id}.{subtask_id}", {
+                "execution_time": execution_time,
+                "status": 1.0 if status == _STATUS_COMPLETED else 0.0
+            }, run_id=run_id)
 
-                if completed_details:
-                    subtask_file = f"./mlflow-artifacts/subtask_{subtask_id}_details.txt"
-                    os.makedirs(os.path.dirname(subtask_file), exist_ok=True)
-                    with open(subtask_file, 'w') as f:
-                        f.write(completed_details)
-                    self.mlflow_manager.log_artifact(subtask_file)
+            if completed_details:
+                self._queue_call(self.mlflow_manager.log_text, completed_details, f"subtask_{subtask_id}_details.txt", run_id=run_id)
 
             return {
                 "status": "task_done",
@@ -237,31 +375,27 @@ class TaskMasterTools:
             }
 
         # Main task case
-        if task["status"] not in [Status.IN_PROGRESS.value, Status.PENDING.value]:
+        if task.status not in (_STATUS_IN_PROGRESS, _STATUS_PENDING):
             return {
                 "status": "already_done",
-                "message": f"Task is already marked {task['status']}."
+                "message": f"Task is already marked {task.status}."
             }
 
-        task["status"] = status
-        task["completed_at"] = datetime.now().isoformat()
-        task["completed_details"] = completed_details
+        self._set_task_status(task, status)
+        self._mark_completed(task, datetime.now())
+        task.completed_details = completed_details
 
         # Log task completion metrics
-        with self.mlflow_manager.start_run(run_name=request_id):
-            execution_time = self._calculate_execution_time(task)
+        run_id = self._request_run_id(request_id)
+        execution_time = self._calculate_execution_time(task)
 
-            self.mlflow_manager.log_task_metrics(task_id, {
-                "execution_time": execution_time,
-                "status": 1.0 if status == Status.COMPLETED.value else 0.0
-            })
+        self._queue_task_metrics(task_id, {
+            "execution_time": execution_time,
+            "status": 1.0 if status == _STATUS_COMPLETED else 0.0
+        }, run_id=run_id)
 
-            if completed_details:
-                task_file = f"./mlflow-artifacts/task_{task_id}_details.txt"
-                os.makedirs(os.path.dirname(task_file), exist_ok=True)
-                with open(task_file, 'w') as f:
-                    f.write(completed_details)
-                self.mlflow_manager.log_artifact(task_file)
+        if completed_details:
+            self._queue_call(self.mlflow_manager.log_text, completed_details, f"task_{task_id}_details.txt", run_id=run_id)
 
         return {
             "status": "task_done",
@@ -286,43 +420,44 @@ class TaskMasterTools:
 
             subtask = self.subtasks[subtask_id]
 
-            if subtask["status"] != Status.COMPLETED.value:
+            if subtask.status != _STATUS_COMPLETED:
                 return {
                     "status": "not_completed",
-                    "message": f"Subtask {subtask_id} is not marked as completed. Current status: {subtask['status']}"
+                    "message": f"Subtask {subtask_id} is not marked as completed. Current status: {subtask.status}"
                 }
 
             # Calculate confidence score for potential auto-approval
             confidence_score = self._calculate_approval_confidence(subtask)
 
             # Determine approval role
-            approval_role = ApprovalRole.AUTO.value if confidence_score >= self.auto_decision_threshold else ApprovalRole.AGENT.value
+            approval_role = _ROLE_AUTO if confidence_score >= self.auto_decision_threshold else _ROLE_AGENT
 
-            # Record approval
-            subtask["approved"] = True
-            subtask["approved_at"] = datetime.now().isoformat()
-            subtask["approval_role"] = approval_role
-            subtask["confidence_score"] = confidence_score
+            # Record approval; one clock read serves every timestamp below
+            now = datetime.now()
+            subtask.approved = True
+            subtask.approved_at = now.isoformat()
+            subtask.approval_role = approval_role
+            subtask.confidence_score = confidence_score
 
             # Log approval to MLflow
-            with self.mlflow_manager.start_run(run_name=request_id):
-                self.mlflow_manager.log_task_metrics(f"{task_id}.{subtask_id}", {
-                    "approval_time": time.time(),
-                    "confidence_score": confidence_score,
-                    "auto_approved": 1.0 if approval_role == ApprovalRole.AUTO.value else 0.0
-                })
+            run_id = self._request_run_id(request_id)
+            self._queue_task_metrics(f"{task_id}.{subtask_id}", {
+                "approval_time": now.timestamp(),
+                "confidence_score": confidence_score,
+                "auto_approved": 1.0 if approval_role == _ROLE_AUTO else 0.0
+            }, run_id=run_id)
 
             # Check if all subtasks are approved for this task
             all_subtasks_approved = True
-            for stid in task["subtasks"]:
+            for stid in task.subtasks:
                 st = self.subtasks[stid]
-                if not st.get("approved", False):
+                if not st.approved:
                     all_subtasks_approved = False
                     break
 
-            if all_subtasks_approved and task["subtasks"]:
-                task["status"] = Status.COMPLETED.value
-                task["completed_at"] = datetime.now().isoformat()
+            if all_subtasks_approved and task.subtasks:
+                self._set_task_status(task, _STATUS_COMPLETED)
+                self._mark_completed(task, now)
 
             return {
                 "status": "approved",
@@ -332,31 +467,39 @@ class TaskMasterTools:
             }
 
         # Main task approval
-        if task["status"] != Status.COMPLETED.value:
+        if task.status != _STATUS_COMPLETED:
             return {
                 "status": "not_completed",
-                "message": f"Task {task_id} is not marked as completed. Current status: {task['status']}"
+                "message": f"Task {task_id} is not marked as completed. Current status: {task.status}"
             }
 
         # Calculate confidence score for potential auto-approval
         confidence_score = self._calculate_approval_confidence(task)
 
         # Determine approval role
-        approval_role = ApprovalRole.AUTO.value if confidence_score >= self.auto_decision_threshold else ApprovalRole.AGENT.value
+        approval_role = _ROLE_AUTO if confidence_score >= self.auto_decision_threshold else _ROLE_AGENT
 
         # Record approval
-        task["approved"] = True
-        task["approved_at"] = datetime.now().isoformat()
-        task["approval_role"] = approval_role
-        task["confidence_score"] = confidence_score
+        now = datetime.now()
+        task.approved = True
+        task.approved_at = now.isoformat()
+        self._approved_tasks[task.request_id].add(task_id)
+        # A re-approval may land on a different role
+        if approval_role == _ROLE_AUTO:
+            self._auto_approved_tasks[task.request_id].add(task_id)
+        else:
+            self._auto_approved_tasks[task.request_id].discard(task_id)
+        self._invalidate_progress(task)
+        task.approval_role = approval_role
+        task.confidence_score = confidence_score
 
         # Log approval to MLflow
-        with self.mlflow_manager.start_run(run_name=request_id):
-            self.mlflow_manager.log_task_metrics(task_id, {
-                "approval_time": time.time(),
-                "confidence_score": confidence_score,
-                "auto_approved": 1.0 if approval_role == ApprovalRole.AUTO.value else 0.0
-            })
+        run_id = self._request_run_id(request_id)
+        self._queue_task_metrics(task_id, {
+            "approval_time": now.timestamp(),
+            "confidence_score": confidence_score,
+            "auto_approved": 1.0 if approval_role == _ROLE_AUTO else 0.0
+        }, run_id=run_id)
 
         return {
             "status": "approved",
@@ -372,12 +515,11 @@ class TaskMasterTools:
         request = self.requests[request_id]
 
         # Check if all tasks are completed and approved
-        all_completed_and_approved = True
-        for task_id in request["tasks"]:
-            task = self.tasks[task_id]
-            if task["status"] != Status.COMPLETED.value or not task.get("approved", False):
-                all_completed_and_approved = False
-                break
+        task_count = len(request.tasks)
+        all_completed_and_approved = (
+            len(self._tasks_by_status[request_id][_STATUS_COMPLETED]) == task_count
+            and len(self._approved_tasks[request_id]) == task_count
+        )
 
         if not all_completed_and_approved:
             return {
@@ -386,27 +528,34 @@ class TaskMasterTools:
             }
 
         # Mark request as completed
-        request["status"] = Status.COMPLETED.value
-        request["completed_at"] = datetime.now().isoformat()
+        request.status = _STATUS_COMPLETED
+        self._mark_completed(request, datetime.now())
 
         # Calculate overall workflow performance metrics
         workflow_metrics = self._calculate_workflow_metrics(request)
 
         # Log workflow completion to MLflow
-        with self.mlflow_manager.start_run(run_name=request_id):
-            for metric_name, value in workflow_metrics.items():
-                self.mlflow_manager.log_workflow_metrics({metric_name: value})
+        run_id = self._request_run_id(request_id)
+        # Workflow metrics and the final status go up in one request
+        self._queue_batch(
+            run_id=run_id,
+            metrics={f"workflow.{metric_name}": value for metric_name, value in workflow_metrics.items()},
+            params={
+                "request_status": _STATUS_COMPLETED,
+                "completed_at": request.completed_at
+            }
+        )
 
-            # Finalize the MLflow run
-            self.mlflow_manager.log_param("request_status", Status.COMPLETED.value)
-            self.mlflow_manager.log_param("completed_at", request["completed_at"])
+        # Save final request state
+        request_file = f"{self.artifact_dir}/request_{request_id}_final.json"
+        with open(request_file, 'wb') as f:
+            f.write(_json_dumps(asdict(request)))
+        self._queue_call(self.mlflow_manager.log_artifact, request_file, run_id=run_id)
 
-            # Save final request state
-            request_file = f"./mlflow-artifacts/request_{request_id}_final.json"
-            os.makedirs(os.path.dirname(request_file), exist_ok=True)
-            with open(request_file, 'w') as f:
-                json.dump(request, f, indent=2)
-            self.mlflow_manager.log_artifact(request_file)
+        # The request is finished; close its run (once, if completion is approved again)
+        if request_id not in self._finished_runs:
+            self._finished_runs.add(request_id)
+            self._queue_call(self.mlflow_manager.end_run, run_id)
 
         return {
             "status": "completed",
@@ -422,13 +571,13 @@ class TaskMasterTools:
         task = self.tasks[task_id]
 
         # Include subtasks if any
-        subtasks_details = []
-        for subtask_id in task.get("subtasks", []):
-            if subtask_id in self.subtasks:
-                subtasks_details.append(self.subtasks[subtask_id])
+        subtasks_details = [
+            asdict(subtask) for subtask_id in task.subtasks
+            if (subtask := self.subtasks.get(subtask_id)) is not None
+        ]
 
         # Create comprehensive task details
-        task_details = dict(task)
+        task_details = asdict(task)
         if subtasks_details:
             task_details["subtasks_data"] = subtasks_details
 
@@ -438,37 +587,31 @@ class TaskMasterTools:
         """List all requests with their status and task summaries."""
         requests_summary = []
 
-        for request_id, request in self.requests.items():
-            # Count tasks by status
-            task_counts = {
-                Status.PENDING.value: 0,
-                Status.IN_PROGRESS.value: 0,
-                Status.COMPLETED.value: 0,
-                Status.FAILED.value: 0
-            }
+        # Requests are only added by request_planning, so insertion order is creation
+        # order and walking it backwards lists the newest first without a sort
+        for request_id in reversed(self.requests):
+            request = self.requests[request_id]
 
-            for task_id in request["tasks"]:
-                if task_id in self.tasks:
-                    task_status = self.tasks[task_id]["status"]
-                    task_counts[task_status] = task_counts.get(task_status, 0) + 1
+            # Count tasks by status
+            task_counts = dict.fromkeys(_TASK_STATUSES, 0)
+            for task_status, task_ids in self._tasks_by_status[request_id].items():
+                if task_ids:
+                    task_counts[task_status] = len(task_ids)
 
             # Create request summary
             summary = {
                 "id": request_id,
-                "status": request["status"],
-                "created_at": request["created_at"],
-                "completed_at": request.get("completed_at"),
-                "priority": request["priority"],
-                "due_date": request["due_date"],
+                "status": request.status,
+                "created_at": request.created_at,
+                "completed_at": request.completed_at,
+                "priority": request.priority,
+                "due_date": request.due_date,
                 "task_summary": task_counts,
-                "total_tasks": len(request["tasks"])
+                "total_tasks": len(request.tasks)
             }
 
             requests_summary.append(summary)
 
-        # Sort by created_at descending (newest first)
-        requests_summary.sort(key=lambda x: x["created_at"], reverse=True)
-
         return {
             "requests": requests_summary,
             "total_requests": len(requests_summary)
@@ -484,44 +627,45 @@ class TaskMasterTools:
 
         # Use request's priority/due_date if not specified
         if priority is None:
-            priority = request["priority"]
+            priority = request.priority
 
         if due_date is None:
-            due_date = request["due_date"]
+            due_date = request.due_date
 
         timestamp = datetime.now().isoformat()
 
         # Create new tasks
-        new_task_ids = []
+        new_tasks = []
         for task_data in tasks:
-            task_id = f"task-{str(uuid.uuid4())[:8]}"
-            task = {
-                "id": task_id,
-                "request_id": request_id,
-                "title": task_data["title"],
-                "description": task_data["description"],
-                "priority": priority,
-                "due_date": due_date,
-                "created_at": timestamp,
-                "status": Status.PENDING.value,
-                "subtasks": []
-            }
+            task_id = f"task-{token_hex(4)}"
+            task = TaskRecord(
+                id=task_id,
+                request_id=request_id,
+                title=task_data["title"],
+                description=task_data["description"],
+                priority=priority,
+                due_date=due_date,
+                created_at=timestamp
+            )
             self.tasks[task_id] = task
-            request["tasks"].append(task_id)
-            new_task_ids.append(task_id)
+            request.tasks.append(task_id)
+            new_tasks.append(task)
+            self._track_new_task(task)
 
         # Log to MLflow
-        with self.mlflow_manager.start_run(run_name=request_id):
-            self.mlflow_manager.log_param("tasks_added_at", timestamp)
-            self.mlflow_manager.log_param("tasks_added_count", len(tasks))
+        run_id = self._request_run_id(request_id)
+        self._queue_batch(run_id=run_id, tags={
+            "tasks_added_at": timestamp,
+            "tasks_added_count": len(tasks)
+        })
 
         return {
             "status": "tasks_added",
             "requestId": request_id,
-            "addedTasks": len(new_task_ids),
-            "totalTasks": len(request["tasks"]),
-            "tasks": [self._get_task_summary(task_id) for task_id in new_task_ids],
-            "message": f"Added {len(new_task_ids)} new tasks to request {request_id}.\n\n{self._generate_progress_table(request_id)}"
+            "addedTasks": len(new_tasks),
+            "totalTasks": len(request.tasks),
+            "tasks": list(map(self._get_task_summary, new_tasks)),
+            "message": f"Added {len(new_tasks)} new tasks to request {request_id}.\n\n{self._generate_progress_table(request_id)}"
         }
 
     def update_task(self, request_id: str, task_id: str,
@@ -545,25 +689,31 @@ class TaskMasterTools:
             subtask = self.subtasks[subtask_id]
 
             # Only allow updates of non-completed subtasks
-            if subtask["status"] in [Status.COMPLETED.value, Status.FAILED.value]:
+            if subtask.status in (_STATUS_COMPLETED, _STATUS_FAILED):
                 return {
                     "status": "cannot_update",
                     "message": f"Cannot update completed or failed subtask {subtask_id}."
                 }
 
+            if not (title or description or priority or due_date):
+                return {
+                    "status": "noop",
+                    "message": f"No changes given for subtask {subtask_id}."
+                }
+
             # Update fields if provided
             if title:
-                subtask["title"] = title
+                subtask.title = title
             if description:
-                subtask["description"] = description
+                subtask.description = description
             if priority:
-                subtask["priority"] = priority
+                subtask.priority = priority
             if due_date:
-                subtask["due_date"] = due_date
+                subtask.due_date = due_date
 
             # Log update to MLflow
-            with self.mlflow_manager.start_run(run_name=request_id):
-                self.mlflow_manager.log_param(f"subtask_{subtask_id}_updated_at", datetime.now().isoformat())
+            run_id = self._request_run_id(request_id)
+            self._queue_batch(run_id=run_id, tags={f"subtask_{subtask_id}_updated_at": datetime.now().isoformat()})
 
             return {
                 "status": "updated",
@@ -574,25 +724,37 @@ class TaskMasterTools:
 
         # Main task update
         # Only allow updates of non-completed tasks
-        if task["status"] in [Status.COMPLETED.value, Status.FAILED.value]:
+        if task.status in (_STATUS_COMPLETED, _STATUS_FAILED):
             return {
                 "status": "cannot_update",
                 "message": f"Cannot update completed or failed task {task_id}."
             }
 
+        if not (title or description or priority or due_date):
+            return {
+                "status": "noop",
+                "message": f"No changes given for task {task_id}."
+            }
+
         # Update fields if provided
         if title:
-            task["title"] = title
+            task.title = title
         if description:
-            task["description"] = description
+            task.description = description
         if priority:
-            task["priority"] = priority
+            task.priority = priority
         if due_date:
-            task["due_date"] = due_date
+            task.due_date = due_date
+        if title or description:
+            self._invalidate_progress(task)
+
+        # Re-queue under the new ordering; the old heap entry no longer matches
+        if (priority or due_date) and task.status == _STATUS_PENDING:
+            self._queue_pending(task)
 
         # Log update to MLflow
-        with self.mlflow_manager.start_run(run_name=request_id):
-            self.mlflow_manager.log_param(f"task_{task_id}_updated_at", datetime.now().isoformat())
+        run_id = self._request_run_id(request_id)
+        self._queue_batch(run_id=run_id, tags={f"task_{task_id}_updated_at": datetime.now().isoformat()})
 
         return {
             "status": "updated",
@@ -619,19 +781,19 @@ class TaskMasterTools:
             subtask = self.subtasks[subtask_id]
 
             # Only allow deletion of non-completed subtasks
-            if subtask["status"] in [Status.COMPLETED.value, Status.FAILED.value]:
+            if subtask.status in (_STATUS_COMPLETED, _STATUS_FAILED):
                 return {
                     "status": "cannot_delete",
                     "message": f"Cannot delete completed or failed subtask {subtask_id}."
                 }
 
             # Remove subtask
-            task["subtasks"].remove(subtask_id)
+            task.subtasks.remove(subtask_id)
             del self.subtasks[subtask_id]
 
             # Log deletion to MLflow
-            with self.mlflow_manager.start_run(run_name=request_id):
-                self.mlflow_manager.log_param(f"subtask_{subtask_id}_deleted_at", datetime.now().isoformat())
+            run_id = self._request_run_id(request_id)
+            self._queue_batch(run_id=run_id, tags={f"subtask_{subtask_id}_deleted_at": datetime.now().isoformat()})
 
             return {
                 "status": "deleted",
@@ -642,24 +804,30 @@ class TaskMasterTools:
 
         # Main task deletion
         # Only allow deletion of non-completed tasks
-        if task["status"] in [Status.COMPLETED.value, Status.FAILED.value]:
+        if task.status in (_STATUS_COMPLETED, _STATUS_FAILED):
             return {
                 "status": "cannot_delete",
                 "message": f"Cannot delete completed or failed task {task_id}."
             }
 
-        # Remove task
-        request["tasks"].remove(task_id)
+        # Remove task (its heap entries are skipped once it's gone)
+        request.tasks.remove(task_id)
         del self.tasks[task_id]
+        del self._task_order[task_id]
+        self._schedule_keys.pop(task_id, None)
+        self._update_task_time(task.request_id, task.execution_time, 0.0)
+        self._tasks_by_status[task.request_id][task.status].discard(task_id)
+        self._status_counts[task.status] -= 1
+        self._invalidate_progress(task)
 
         # Remove associated subtasks
-        for subtask_id in task.get("subtasks", []):
+        for subtask_id in task.subtasks:
             if subtask_id in self.subtasks:
                 del self.subtasks[subtask_id]
 
         # Log deletion to MLflow
-        with self.mlflow_manager.start_run(run_name=request_id):
-            self.mlflow_manager.log_param(f"task_{task_id}_deleted_at", datetime.now().isoformat())
+        run_id = self._request_run_id(request_id)
+        self._queue_batch(run_id=run_id, tags={f"task_{task_id}_deleted_at": datetime.now().isoformat()})
 
         return {
             "status": "deleted",
@@ -681,43 +849,44 @@ class TaskMasterTools:
 
         # Use task's priority/due_date if not specified
         if priority is None:
-            priority = task["priority"]
+            priority = task.priority
 
         if due_date is None:
-            due_date = task["due_date"]
+            due_date = task.due_date
 
         timestamp = datetime.now().isoformat()
 
         # Create subtasks
-        new_subtask_ids = []
+        new_subtasks = []
         for subtask_data in subtasks:
-            subtask_id = f"subtask-{str(uuid.uuid4())[:8]}"
-            subtask = {
-                "id": subtask_id,
-                "task_id": task_id,
-                "request_id": request_id,
-                "title": subtask_data["title"],
-                "description": subtask_data["description"],
-                "priority": priority,
-                "due_date": due_date,
-                "created_at": timestamp,
-                "status": Status.PENDING.value
-            }
+            subtask_id = f"subtask-{token_hex(4)}"
+            subtask = SubtaskRecord(
+                id=subtask_id,
+                task_id=task_id,
+                request_id=request_id,
+                title=subtask_data["title"],
+                description=subtask_data["description"],
+                priority=priority,
+                due_date=due_date,
+                created_at=timestamp
+            )
             self.subtasks[subtask_id] = subtask
-            task["subtasks"].append(subtask_id)
-            new_subtask_ids.append(subtask_id)
+            task.subtasks.append(subtask_id)
+            new_subtasks.append(subtask)
 
         # Log to MLflow
-        with self.mlflow_manager.start_run(run_name=request_id):
-            self.mlflow_manager.log_param(f"task_{task_id}_subtasks_created_at", timestamp)
-            self.mlflow_manager.log_param(f"task_{task_id}_subtasks_count", len(subtasks))
+        run_id = self._request_run_id(request_id)
+        self._queue_batch(run_id=run_id, tags={
+            f"task_{task_id}_subtasks_created_at": timestamp,
+            f"task_{task_id}_subtasks_count": len(subtasks)
+        })
 
         return {
             "status": "subtasks_created",
             "taskId": task_id,
-            "subtasks": [self._get_subtask_summary(subtask_id) for subtask_id in new_subtask_ids],
-            "totalSubtasks": len(task["subtasks"]),
-            "message": f"Created {len(new_subtask_ids)} subtasks for task {task_id}.\n\n{self._generate_progress_table(request_id)}"
+            "subtasks": list(map(self._get_subtask_summary, new_subtasks)),
+            "totalSubtasks": len(task.subtasks),
+            "message": f"Created {len(new_subtasks)} subtasks for task {task_id}.\n\n{self._generate_progress_table(request_id)}"
         }
 
     def notify_task_event(self, request_id: str, task_id: str,
@@ -731,8 +900,8 @@ class TaskMasterTools:
             raise ValueError(f"Task ID {task_id} not found")
 
         # Validate event
-        if event not in [e.value for e in Event]:
-            raise ValueError(f"Invalid event: {event}. Must be one of: {[e.value for e in Event]}")
+        if event not in _EVENT_VALUES:
+            raise ValueError(f"Invalid event: {event}. Must be one of: {_EVENT_VALUES}")
 
         task = self.tasks[task_id]
 
@@ -743,29 +912,33 @@ class TaskMasterTools:
 
             subtask = self.subtasks[subtask_id]
 
+            # Events are named after the status they set, so a repeat changes nothing
+            if subtask.status == event:
+                return {
+                    "status": "noop",
+                    "message": f"Subtask {subtask_id} is already {event}."
+                }
+
             # Update subtask status based on event
-            if event == Event.COMPLETED.value:
-                subtask["status"] = Status.COMPLETED.value
-                subtask["completed_at"] = datetime.now().isoformat()
-                subtask["completed_details"] = completed_details
-            elif event == Event.FAILED.value:
-                subtask["status"] = Status.FAILED.value
-                subtask["failed_at"] = datetime.now().isoformat()
-                subtask["failure_details"] = completed_details
+            now = datetime.now()
+            if event == _EVENT_COMPLETED:
+                subtask.status = _STATUS_COMPLETED
+                self._mark_completed(subtask, now)
+                subtask.completed_details = completed_details
+            elif event == _EVENT_FAILED:
+                subtask.status = _STATUS_FAILED
+                subtask.failed_at = now.isoformat()
+                subtask.failure_details = completed_details
 
             # Log event to MLflow
-            with self.mlflow_manager.start_run(run_name=request_id):
-                self.mlflow_manager.log_task_metrics(f"{task_id}.{subtask_id}", {
-                    "event_time": time.time(),
-                    "event_success": 1.0 if event == Event.COMPLETED.value else 0.0
-                })
-
-                if completed_details:
-                    details_file = f"./mlflow-artifacts/subtask_{subtask_id}_event_details.txt"
-                    os.makedirs(os.path.dirname(details_file), exist_ok=True)
-                    with open(details_file, 'w') as f:
-                        f.write(completed_details)
-                    self.mlflow_manager.log_artifact(details_file)
+            run_id = self._request_run_id(request_id)
+            self._queue_task_metrics(f"{task_id}.{subtask_id}", {
+                "event_time": now.timestamp(),
+                "event_success": 1.0 if event == _EVENT_COMPLETED else 0.0
+            }, run_id=run_id)
+
+            if completed_details:
+                self._queue_call(self.mlflow_manager.log_text, completed_details, f"subtask_{subtask_id}_event_details.txt", run_id=run_id)
 
             return {
                 "status": "event_processed",
@@ -776,29 +949,32 @@ class TaskMasterTools:
             }
 
         # Main task event
+        if task.status == event:
+            return {
+                "status": "noop",
+                "message": f"Task {task_id} is already {event}."
+            }
+
         # Update task status based on event
-        if event == Event.COMPLETED.value:
-            task["status"] = Status.COMPLETED.value
-            task["completed_at"] = datetime.now().isoformat()
-            task["completed_details"] = completed_details
-        elif event == Event.FAILED.value:
-            task["status"] = Status.FAILED.value
-            task["failed_at"] = datetime.now().isoformat()
-            task["failure_details"] = completed_details
+        now = datetime.now()
+        if event == _EVENT_COMPLETED:
+            self._set_task_status(task, _STATUS_COMPLETED)
+            self._mark_completed(task, now)
+            task.completed_details = completed_details
+        elif event == _EVENT_FAILED:
+            self._set_task_status(task, _STATUS_FAILED)
+            task.failed_at = now.isoformat()
+            task.failure_details = completed_details
 
         # Log event to MLflow
-        with self.mlflow_manager.start_run(run_name=request_id):
-            self.mlflow_manager.log_task_metrics(task_id, {
-                "event_time": time.time(),
-                "event_success": 1.0 if event == Event.COMPLETED.value else 0.0
-            })
+        run_id = self._request_run_id(request_id)
+        self._queue_task_metrics(task_id, {
+            "event_time": now.timestamp(),
+            "event_success": 1.0 if event == _EVENT_COMPLETED else 0.0
+        }, run_id=run_id)
 
-            if completed_details:
-                details_file = f"./mlflow-artifacts/task_{task_id}_event_details.txt"
-                os.makedirs(os.path.dirname(details_file), exist_ok=True)
-                with open(details_file, 'w') as f:
-                    f.write(completed_details)
-                self.mlflow_manager.log_artifact(details_file)
+        if completed_details:
+            self._queue_call(self.mlflow_manager.log_text, completed_details, f"task_{task_id}_event_details.txt", run_id=run_id)
 
         return {
             "status": "event_processed",
@@ -807,43 +983,190 @@ class TaskMasterTools:
             "message": f"Event {event} processed for task {task_id}.\n\n{self._generate_progress_table(request_id)}"
         }
 
+    @classmethod
+    def flush_mlflow(cls, timeout: Optional[float] = None) -> None:
+        """Block until every queued MLflow write has been sent, or for at most ``timeout`` seconds."""
+        if timeout is None:
+            cls._mlflow_queue.join()
+            return
+
+        deadline = time.monotonic() + timeout
+        with cls._mlflow_queue.all_tasks_done:
+            while cls._mlflow_queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(
+                        f"Gave up waiting on {cls._mlflow_queue.unfinished_tasks} queued MLflow writes after {timeout}s"
+                    )
+                    return
+                cls._mlflow_queue.all_tasks_done.wait(remaining)
+
     # Helper methods
-    def _get_task_summary(self, task_id: str) -> Dict:
+    def _request_run_id(self, request_id: str) -> str:
+        """Get the MLflow run of a request, creating it on first use."""
+        run_id = self._request_runs.get(request_id)
+        if run_id is None:
+            run_id = self._request_runs[request_id] = self.mlflow_manager.create_run(run_name=request_id)
+        return run_id
+
+    def _queue_call(self, fn, *args, **kwargs) -> None:
+        """Queue an MLflow call to run on the background worker, in order."""
+        self._mlflow_queue.put((fn, args, kwargs))
+
+    def _queue_batch(self, run_id: str, metrics: Dict[str, float] = None,
+                     params: Dict[str, Any] = None, tags: Dict[str, Any] = None) -> None:
+        """Queue metrics, params and tags for a run; see ``MLflowManager.log_batch``."""
+        # Batches carry their manager, like the bound methods queued by _queue_call
+        self._mlflow_queue.put((None, (self.mlflow_manager, run_id), {
+            "metrics": dict(metrics or {}),
+            "params": dict(params or {}),
+            "tags": dict(tags or {})
+        }))
+
+    def _queue_task_metrics(self, task_id: str, metrics: Dict[str, float], run_id: str) -> None:
+        """Queue task-specific metrics; see ``MLflowManager.log_task_metrics``."""
+        self._queue_batch(run_id, metrics={f"task.{task_id}.{name}": value for name, value in metrics.items()})
+
+    @classmethod
+    def _start_mlflow_worker(cls) -> None:
+        """Start the shared MLflow worker unless it is already running."""
+        with cls._mlflow_worker_lock:
+            if cls._mlflow_worker is not None:
+                return
+            cls._mlflow_worker = threading.Thread(target=cls._drain_mlflow, name="taskmaster-mlflow", daemon=True)
+            cls._mlflow_worker.start()
+            # Bounded, so an unreachable tracking server can't hang interpreter exit
+            atexit.register(cls.flush_mlflow, _MLFLOW_EXIT_TIMEOUT)
+
+    @classmethod
+    def _drain_mlflow(cls) -> None:
+        """Background worker: send queued MLflow writes, merging adjacent batches."""
+        while True:
+            pending = [cls._mlflow_queue.get()]
+            # Collect what arrives over a short window so bursts can share requests
+            deadline = time.monotonic() + _MLFLOW_FLUSH_WINDOW
+            while len(pending) < _MLFLOW_FLUSH_MAX_CALLS:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(cls._mlflow_queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            for fn, args, kwargs in cls._merge_batches(pending):
+                try:
+                    if fn is None:
+                        manager, run_id = args
+                        manager.log_batch(run_id=run_id, **kwargs)
+                    else:
+                        fn(*args, **kwargs)
+                except Exception as e:
+                    logger.warning(f"MLflow logging failed: {str(e)}")
+
+            for _ in pending:
+                cls._mlflow_queue.task_done()
+
+    @staticmethod
+    def _merge_batches(pending: List[tuple]) -> List[tuple]:
+        """Merge runs of queued batches for the same run, keeping every other call in place."""
+        merged = []
+        for fn, args, kwargs in pending:
+            if fn is None and merged and merged[-1][0] is None and merged[-1][1] == args:
+                batch = merged[-1][2]
+                # A repeated metric key is a new data point and would be lost in a merge
+                if (
+                    batch["metrics"].keys().isdisjoint(kwargs["metrics"])
+                    and len(batch["metrics"]) + len(kwargs["metrics"]) <= _MAX_BATCH_METRICS
+                    and len(batch["params"]) + len(batch["tags"]) + len(kwargs["params"]) + len(kwargs["tags"])
+                    <= _MAX_BATCH_PARAMS_AND_TAGS
+                ):
+                    batch["metrics"].update(kwargs["metrics"])
+                    batch["params"].update(kwargs["params"])
+                    batch["tags"].update(kwargs["tags"])
+                    continue
+            merged.append((fn, args, kwargs))
+        return merged
+
+    def _queue_pending(self, task: TaskRecord) -> None:
+        """Push a pending task onto its request's heap: highest priority, then earliest due date, then oldest."""
+        key = self._schedule_keys[task.id] = (
+            _PRIORITY_SORT_KEY.get(task.priority, 0),
+            task.due_date or _NO_DUE_DATE,
+            self._task_order[task.id],
+            task.id
+        )
+        heapq.heappush(self._pending_heaps[task.request_id], key)
+
+    def _track_new_task(self, task: TaskRecord) -> None:
+        """Bucket a newly created (pending) task and queue it for get_next_task."""
+        self._task_order[task.id] = next(self._task_seq)
+        self._tasks_by_status[task.request_id][task.status].add(task.id)
+        self._status_counts[task.status] += 1
+        self._invalidate_progress(task)
+        self._queue_pending(task)
+
+    def _set_task_status(self, task: TaskRecord, status: str) -> None:
+        """Change a task's status, keeping the request's status buckets and pending heap current."""
+        tasks_by_status = self._tasks_by_status[task.request_id]
+        tasks_by_status[task.status].discard(task.id)
+        tasks_by_status[status].add(task.id)
+        self._status_counts[task.status] -= 1
+        self._status_counts[status] += 1
+        task.status = status
+        self._invalidate_progress(task)
+        if status == _STATUS_PENDING:
+            self._queue_pending(task)
+
+    def _invalidate_progress(self, task: TaskRecord) -> None:
+        """Drop a task's cached progress row, and its request's table, after a change to it."""
+        self._progress_rows.pop(task.id, None)
+        self._progress_cache.pop(task.request_id, None)
+
+    def _get_task_summary(self, task: TaskRecord) -> Dict:
         """Get a summary of a task for display."""
-        task = self.tasks[task_id]
         return {
-            "id": task_id,
-            "title": task["title"],
-            "description": task["description"],
-            "status": task["status"],
-            "subtasks_count": len(task.get("subtasks", [])),
-            "approved": task.get("approved", False)
+            "id": task.id,
+            "title": task.title,
+            "description": task.description,
+            "status": task.status,
+            "subtasks_count": len(task.subtasks),
+            "approved": task.approved
         }
 
-    def _get_subtask_summary(self, subtask_id: str) -> Dict:
+    def _get_subtask_summary(self, subtask: SubtaskRecord) -> Dict:
         """Get a summary of a subtask for display."""
-        subtask = self.subtasks[subtask_id]
         return {
-            "id": subtask_id,
-            "title": subtask["title"],
-            "description": subtask["description"],
-            "status": subtask["status"],
-            "approved": subtask.get("approved", False)
+            "id": subtask.id,
+            "title": subtask.title,
+            "description": subtask.description,
+            "status": subtask.status,
+            "approved": subtask.approved
         }
 
-    def _calculate_execution_time(self, task_obj: Dict) -> float:
-        """Calculate the execution time of a task or subtask."""
-        if "completed_at" not in task_obj or "created_at" not in task_obj:
-            return 0.0
-
-        try:
-            start_time = datetime.fromisoformat(task_obj["created_at"]).timestamp()
-            end_time = datetime.fromisoformat(task_obj["completed_at"]).timestamp()
-            return end_time - start_time
-        except (ValueError, TypeError):
-            return 0.0
-
-    def _calculate_approval_confidence(self, task_obj: Dict) -> float:
+    def _mark_completed(self, task_obj: Union[RequestRecord, TaskRecord, SubtaskRecord], now: datetime) -> None:
+        """Stamp a request, task or subtask as completed now, working out its execution time once."""
+        task_obj.completed_at = now.isoformat()
+        execution_time = (now - datetime.fromisoformat(task_obj.created_at)).total_seconds()
+        if isinstance(task_obj, TaskRecord):
+            self._update_task_time(task_obj.request_id, task_obj.execution_time, execution_time)
+        task_obj.execution_time = execution_time
+
+    def _update_task_time(self, request_id: str, old: float, new: float) -> None:
+        """Swap one task's execution time in its request's running totals."""
+        totals = self._task_time_totals[request_id]
+        if old > 0:
+            totals[0] -= old
+            totals[1] -= 1
+        if new > 0:
+            totals[0] += new
+            totals[1] += 1
+
+    def _calculate_execution_time(self, task_obj: Union[TaskRecord, SubtaskRecord]) -> float:
+        """Get the execution time of a task or subtask (0.0 until it completes)."""
+        return task_obj.execution_time
+
+    def _calculate_approval_confidence(self, task_obj: Union[TaskRecord, SubtaskRecord]) -> float:
         """Calculate the confidence score for auto-approval."""
         # Start with a base confidence
         base_confidence = 0.7
@@ -851,22 +1174,17 @@ class TaskMasterTools:
         # Adjust based on execution time (faster tasks might be more reliable)
         execution_time = self._calculate_execution_time(task_obj)
         # Normalize execution time: tasks under 30s get a boost, over 5 minutes get a penalty
-        if execution_time < 30:
-            time_factor = 0.1
-        elif execution_time > 300:
-            time_factor = -0.1
-        else:
-            time_factor = 0
+        # (the comparisons are bools, so each band adds its factor or nothing)
+        time_factor = 0.1 * (execution_time < 30) - 0.1 * (execution_time > 300)
 
         # Adjust based on task complexity (approximated by description length)
-        description_len = len(task_obj.get("description", ""))
+        description_len = len(task_obj.description)
         # Penalize very short or very long descriptions
-        if description_len < 50:
-            complexity_factor = -0.05
-        elif description_len > 1000:
-            complexity_factor = -0.1
-        else:
-            complexity_factor = 0.05
+        complexity_factor = (
+            0.05 * (50 <= description_len <= 1000)
+            - 0.05 * (description_len < 50)
+            - 0.1 * (description_len > 1000)
+        )
 
         # Adjust based on history (placeholder for RL component)
         history_factor = 0
@@ -877,46 +1195,28 @@ class TaskMasterTools:
         # Bound between 0 and 1
         return max(0.0, min(1.0, confidence))
 
-    def _calculate_workflow_metrics(self, request: Dict) -> Dict:
+    def _calculate_workflow_metrics(self, request: RequestRecord) -> Dict:
         """Calculate overall workflow performance metrics."""
         metrics = {}
 
-        # Calculate total execution time
-        if "completed_at" in request and "created_at" in request:
-            try:
-                start_time = datetime.fromisoformat(request["created_at"]).timestamp()
-                end_time = datetime.fromisoformat(request["completed_at"]).timestamp()
-                metrics["total_execution_time"] = end_time - start_time
-            except (ValueError, TypeError):
-                metrics["total_execution_time"] = 0.0
+        # Total execution time, worked out when the request completed
+        if request.completed_at is not None:
+            metrics["total_execution_time"] = request.execution_time
 
         # Calculate task statistics
-        task_count = len(request["tasks"])
-        auto_approved_count = 0
-        error_count = 0
+        task_count = len(request.tasks)
+        # Failed and auto-approved tasks are already tracked per request
+        auto_approved_count = len(self._auto_approved_tasks[request.id])
+        error_count = len(self._tasks_by_status[request.id][_STATUS_FAILED])
 
-        task_times = []
-        for task_id in request["tasks"]:
-            task = self.tasks[task_id]
-
-            # Track auto-approved tasks
-            if task.get("approval_role") == ApprovalRole.AUTO.value:
-                auto_approved_count += 1
-
-            # Track errors
-            if task.get("status") == Status.FAILED.value:
-                error_count += 1
-
-            # Track task execution times
-            execution_time = self._calculate_execution_time(task)
-            if execution_time > 0:
-                task_times.append(execution_time)
+        # Execution times are totalled as tasks complete
+        task_time_sum, timed_task_count = self._task_time_totals[request.id]
 
         # Calculate metrics
         metrics["task_count"] = task_count
         metrics["auto_approval_rate"] = auto_approved_count / task_count if task_count > 0 else 0
         metrics["error_rate"] = error_count / task_count if task_count > 0 else 0
-        metrics["avg_task_time"] = sum(task_times) / len(task_times) if task_times else 0
+        metrics["avg_task_time"] = task_time_sum / timed_task_count if timed_task_count else 0
         metrics["success_rate"] = 1.0 - metrics["error_rate"]
 
         return metrics
@@ -927,44 +1227,49 @@ class TaskMasterTools:
         return {
             "system_load": 0.5,  # Example: CPU load between 0-1
             "memory_usage": 0.3,  # Example: Memory usage between 0-1
-            "pending_task_count": sum(1 for t in self.tasks.values() if t["status"] == Status.PENDING.value),
-            "in_progress_task_count": sum(1 for t in self.tasks.values() if t["status"] == Status.IN_PROGRESS.value)
+            "pending_task_count": self._status_counts[_STATUS_PENDING],
+            "in_progress_task_count": self._status_counts[_STATUS_IN_PROGRESS]
         }
 
     def _generate_progress_table(self, request_id: str) -> str:
-        """Generate a markdown progress table for the request."""
+        """Get the markdown progress table for the request, rendering it only after changes."""
         if request_id not in self.requests:
             return "Request not found"
 
-        request = self.requests[request_id]
-
-        # Table header
-        table = "Progress Status:\n"
-        table += "| Task ID | Title | Description | Status | Approval |\n"
-        table += "|----------|----------|------|------|----------|\n"
-
-        # Add rows for each task
-        for task_id in request["tasks"]:
-            if task_id in self.tasks:
-                task = self.tasks[task_id]
-
-                # Status emoji
-                status_emoji = {
-                    Status.PENDING.value: "⏳ Pending",
-                    Status.IN_PROGRESS.value: "🔄 In Progress",
-                    Status.COMPLETED.value: "✅ Completed",
-                    Status.FAILED.value: "❌ Failed"
-                }.get(task["status"], task["status"])
-
-                # Approval status
-                approval_status = "✓ Approved" if task.get("approved", False) else "⏳ Pending"
-
-                # Truncate description if too long
-                description = task["description"]
-                if len(description) > 50:
-                    description = description[:50] + "..."
-
-                # Add row
-                table += f"| {task_id} | {task['title']} | {description} | {status_emoji} | {approval_status} |\n"
-
+        table = self._progress_cache.get(request_id)
+        if table is None:
+            table = self._progress_cache[request_id] = self._render_progress_table(request_id)
         return table
+
+    def _render_progress_table(self, request_id: str) -> str:
+        """Generate a markdown progress table for the request."""
+        request = self.requests[request_id]
+        tasks = self.tasks
+        progress_rows = self._progress_rows
+
+        # Collect the rows and join once, rather than growing a string per row;
+        # rows of unchanged tasks are reused as rendered
+        rows = [_PROGRESS_HEADER]
+        for task_id in request.tasks:
+            row = progress_rows.get(task_id)
+            if row is None:
+                task = tasks.get(task_id)
+                if task is None:
+                    continue
+                row = progress_rows[task_id] = self._render_progress_row(task)
+            rows.append(row)
+
+        return "".join(rows)
+
+    def _render_progress_row(self, task: TaskRecord) -> str:
+        """Generate the progress table row of a task."""
+        status = task.status
+        status_emoji = _STATUS_EMOJI.get(status, status)
+        approval_status = "✓ Approved" if task.approved else "⏳ Pending"
+
+        # Truncate description if too long
+        description = task.description
+        if len(description) > 50:
+            description = description[:50] + "..."
+
+        return f"| {task.id} | {task.title} | {description} | {status_emoji} | {approval_status} |\n"
@@ -1,10 +1,19 @@
 # src/main/utils/mlflow_manager.py
 import os
 import re
+import contextlib
+import functools
+import time
 import yaml
 import mlflow
+from mlflow.entities import Metric, Param, RunTag
+from mlflow.tracking import MlflowClient
 from typing import Dict, Any
 
+# Value length limits enforced by older tracking servers; longer values are rejected
+MAX_PARAM_VALUE_LENGTH = 500
+MAX_TAG_VALUE_LENGTH = 5000
+
 class MLflowManager:
     """MLflow manager utility for CrewAI agents."""
 
@@ -38,41 +47,119 @@ class MLflowManager:
         host = server_config.get('host', '127.0.0.1')
         port = server_config.get('port', 5000)
         mlflow.set_tracking_uri(f"http://{host}:{port}")
+        self.client = MlflowClient()
 
         # Set experiment
         experiment_name = tracking_config.get('experiment_name', 'ai_agents')
-        mlflow.set_experiment(experiment_name)
+        self.experiment_id = mlflow.set_experiment(experiment_name).experiment_id
+
+        # Log from a background thread pool so tools don't block on the tracking server
+        async_config = tracking_config.get('async_logging', {})
+        self.async_logging = async_config.get('enabled', True)
+        if self.async_logging:
+            os.environ.setdefault("MLFLOW_ASYNC_LOGGING_THREADPOOL_SIZE",
+                                  str(async_config.get('threadpool_size', 4)))
+            os.environ.setdefault("MLFLOW_ASYNC_LOGGING_BUFFERING_SECONDS",
+                                  str(async_config.get('buffering_seconds', 1)))
+            mlflow.config.enable_async_logging()
+
+    def start_run(self, run_id: str = None, run_name: str = None, reuse_active: bool = False):
+        """
+        Start MLflow run with optional name.
+
+        When a run is already active (e.g. the crew run opened by
+        ``kickoff_with_mlflow``), ``reuse_active=True`` logs straight into it
+        instead of creating a run; otherwise a nested child run is started.
+        """
+        active_run = mlflow.active_run()
+        if active_run is not None and reuse_active and run_id is None:
+            return contextlib.nullcontext(active_run)
 
-    def start_run(self, run_id: str = None, run_name: str = None):
-        """Start MLflow run with optional name."""
         prefix = self.config.get('tracking', {}).get('run_name_prefix', 'workflow_')
         if run_name:
             run_name = f"{prefix}{run_name}"
-        return mlflow.start_run(run_id=run_id, run_name=run_name)
+        return mlflow.start_run(run_id=run_id, run_name=run_name, nested=active_run is not None)
+
+    def create_run(self, run_name: str = None) -> str:
+        """
+        Create a run without activating it and return its ID.
 
-    def log_task_metrics(self, task_id: str, metrics: Dict[str, float]):
+        For long-lived runs that are logged to by ``run_id`` across many calls
+        (e.g. one per TaskMaster request) and closed with ``end_run(run_id)``.
+        The run is parented to the active run, if any, like a nested run.
+        """
+        prefix = self.config.get('tracking', {}).get('run_name_prefix', 'workflow_')
+        if run_name:
+            run_name = f"{prefix}{run_name}"
+        active_run = mlflow.active_run()
+        tags = {"mlflow.parentRunId": active_run.info.run_id} if active_run is not None else None
+        return self.client.create_run(self.experiment_id, run_name=run_name, tags=tags).info.run_id
+
+    def log_task_metrics(self, task_id: str, metrics: Dict[str, float], run_id: str = None):
         """Log task-specific metrics."""
-        for name, value in metrics.items():
-            mlflow.log_metric(f"task.{task_id}.{name}", value)
+        self.log_batch(metrics={f"task.{task_id}.{name}": value for name, value in metrics.items()}, run_id=run_id)
 
-    def log_workflow_metrics(self, metrics: Dict[str, float]):
+    def log_workflow_metrics(self, metrics: Dict[str, float], run_id: str = None):
         """Log workflow-level metrics."""
-        for name, value in metrics.items():
-            mlflow.log_metric(f"workflow.{name}", value)
+        self.log_batch(metrics={f"workflow.{name}": value for name, value in metrics.items()}, run_id=run_id)
 
     def log_agent_metrics(self, agent_id: str, metrics: Dict[str, float]):
         """Log agent-specific metrics."""
-        for name, value in metrics.items():
-            mlflow.log_metric(f"agent.{agent_id}.{name}", value)
+        self.log_batch(metrics={f"agent.{agent_id}.{name}": value for name, value in metrics.items()})
 
-    def end_run(self):
-        """End current MLflow run."""
-        mlflow.end_run()
+    def end_run(self, run_id: str = None, status: str = "FINISHED"):
+        """End the given run (one from ``create_run``), or the current MLflow run."""
+        if run_id is None:
+            mlflow.end_run(status)
+        else:
+            self.client.set_terminated(run_id, status)
 
     def log_param(self, key: str, value: Any):
         """Log a single parameter."""
-        mlflow.log_param(key, value)
-
-    def log_artifact(self, local_path: str):
-        """Log a local file or directory as an artifact."""
-        mlflow.log_artifact(local_path)
+        mlflow.log_param(key, str(value)[:MAX_PARAM_VALUE_LENGTH])
+
+    def log_batch(self, metrics: Dict[str, float] = None, params: Dict[str, Any] = None,
+                  tags: Dict[str, Any] = None, run_id: str = None):
+        """
+        Log metrics, params and tags in a single request.
+
+        Without a ``run_id`` this logs to the active run, starting one when none
+        is active, the same as ``mlflow.log_metric`` and friends.
+        """
+        if run_id is None:
+            active_run = mlflow.active_run() or mlflow.start_run()
+            run_id = active_run.info.run_id
+        timestamp = int(time.time() * 1000)
+        self.client.log_batch(
+            run_id,
+            metrics=[Metric(key, float(value), timestamp, 0) for key, value in (metrics or {}).items()],
+            params=[Param(key, str(value)[:MAX_PARAM_VALUE_LENGTH]) for key, value in (params or {}).items()],
+            tags=[RunTag(key, str(value)[:MAX_TAG_VALUE_LENGTH]) for key, value in (tags or {}).items()],
+            synchronous=not self.async_logging
+        )
+
+    def log_artifact(self, local_path: str, run_id: str = None):
+        """Log a local file or directory as an artifact (defaults to the active run)."""
+        if run_id is None:
+            mlflow.log_artifact(local_path)
+        else:
+            self.client.log_artifact(run_id, local_path)
+
+    def log_dict(self, dictionary: Any, artifact_file: str, run_id: str = None):
+        """Serialize a dict/list in memory and log it as a JSON or YAML artifact."""
+        if run_id is None:
+            mlflow.log_dict(dictionary, artifact_file)
+        else:
+            self.client.log_dict(run_id, dictionary, artifact_file)
+
+    def log_text(self, text: str, artifact_file: str, run_id: str = None):
+        """Log a string as a text artifact without writing a local file."""
+        if run_id is None:
+            mlflow.log_text(text, artifact_file)
+        else:
+            self.client.log_text(run_id, text, artifact_file)
+
+@functools.cache
+def get_manager() -> MLflowManager:
+    """Return the process-wide MLflowManager, creating it on first use."""
+    return MLflowManager()
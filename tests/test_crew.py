@@ -0,0 +1,84 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("crewai")
+pytest.importorskip("mlflow")
+
+from crewai import Agent, Task
+
+from main import crew as crew_module
+from main.crew import AsyncBatcher, CrewFactory, TaskMasterCrew, _load_yaml_cached, _load_yaml_snapshot
+
+
+class FlakyCrew(TaskMasterCrew):
+    """Echoes its inputs, failing for the ones marked ``fail``."""
+
+    def __init__(self):
+        # Skip the MLflow manager; kickoff below doesn't log
+        pass
+
+    def kickoff(self, inputs):
+        if inputs.get("fail"):
+            raise RuntimeError(f"kickoff {inputs['n']} failed")
+        return inputs["n"]
+
+
+def test_kickoff_batch_keeps_other_results_when_one_fails():
+    inputs = [{"n": n, "fail": n == 2} for n in range(5)]
+
+    results = FlakyCrew().kickoff_batch(inputs, max_concurrency=2)
+
+    assert results[:2] == [0, 1] and results[3:] == [3, 4]
+    assert isinstance(results[2], RuntimeError)
+    assert str(results[2]) == "kickoff 2 failed"
+
+
+def test_async_batcher_fails_only_the_failing_submit():
+    async def run():
+        batcher = AsyncBatcher(FlakyCrew(), max_batch_size=8, max_batch_time=0.05, max_concurrency=2)
+        results = await asyncio.gather(
+            *(batcher.submit({"n": n, "fail": n == 3}) for n in range(6)),
+            return_exceptions=True
+        )
+        await batcher.close()
+        return results
+
+    results = asyncio.run(run())
+
+    assert results[:3] == [0, 1, 2] and results[4:] == [4, 5]
+    assert isinstance(results[3], RuntimeError)
+    assert str(results[3]) == "kickoff 3 failed"
+
+
+@pytest.mark.parametrize("text, cached", [
+    ("k: {n: 1}\n", True),
+    ("1: x\nk: v\n", False),          # int key would come back as "1"
+    ("d: 2024-01-01\n", False),        # dates aren't JSON
+])
+def test_yaml_sidecar_only_caches_exact_round_trips(tmp_path, text, cached):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(text)
+
+    first = _load_yaml_cached(config_path)
+    # A fresh process would go through the sidecar again
+    _load_yaml_snapshot.cache_clear()
+
+    assert _load_yaml_cached(config_path) == first
+    assert (tmp_path / "config.yaml.cache.json").exists() == cached
+
+
+def test_create_crew_indexes_agents_by_role(monkeypatch):
+    # Agents build their LLM client up front, which needs a key but no network
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(crew_module, "get_manager", mock.MagicMock)
+    researcher = Agent(role="Researcher", goal="Find facts", backstory="Curious")
+    writer = Agent(role="Writer", goal="Write reports", backstory="Clear")
+    task = Task(description="Research the topic", expected_output="Notes", agent=researcher)
+
+    crew = CrewFactory().create_crew("demo", [researcher, writer], [task])
+
+    assert CrewFactory.get_agent(crew, "Writer") is writer
+    assert CrewFactory.get_agent(crew, "Researcher") is researcher
+    assert crew.kickoff.__name__ == "kickoff_with_mlflow"
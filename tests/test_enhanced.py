@@ -0,0 +1,81 @@
+import json
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("crewai")
+pytest.importorskip("mlflow")
+
+from main.tools import enhanced
+from main.tools.enhanced import Memory
+
+
+@pytest.fixture(autouse=True)
+def mlflow_manager(monkeypatch):
+    manager = mock.MagicMock()
+    monkeypatch.setattr(enhanced, "get_manager", lambda: manager)
+    return manager
+
+
+def _access_count(memory, key):
+    with memory._lock:
+        return memory._connect().execute("SELECT access_count FROM memories WHERE key = ?", (key,)).fetchone()[0]
+
+
+def test_store_and_retrieve_round_trip(tmp_path):
+    memory = Memory(memory_dir=str(tmp_path))
+
+    assert memory._run("colour", value="blue", context="preferences") == "Memory stored successfully with key: colour"
+    assert memory._run("colour") == "blue"
+
+    # A new tool over the same directory sees what the first one stored
+    assert Memory(memory_dir=str(tmp_path))._run("colour") == "blue"
+
+
+@pytest.mark.parametrize("has_returning", [True, False])
+def test_retrieve_counts_accesses(tmp_path, monkeypatch, mlflow_manager, has_returning):
+    monkeypatch.setattr(enhanced, "_SQLITE_HAS_RETURNING", has_returning)
+    memory = Memory(memory_dir=str(tmp_path))
+    memory._run("colour", value="blue")
+
+    for _ in range(3):
+        assert memory._run("colour") == "blue"
+
+    assert _access_count(memory, "colour") == 3
+    logged = mlflow_manager.log_batch.call_args.kwargs["metrics"]
+    assert list(logged.values()) == [3]
+
+    # Storing again overwrites the memory and resets its count
+    memory._run("colour", value="green")
+    assert memory._run("colour") == "green"
+    assert _access_count(memory, "colour") == 1
+
+
+@pytest.mark.parametrize("has_returning", [True, False])
+def test_retrieve_missing_key(tmp_path, monkeypatch, mlflow_manager, has_returning):
+    monkeypatch.setattr(enhanced, "_SQLITE_HAS_RETURNING", has_returning)
+    memory = Memory(memory_dir=str(tmp_path))
+
+    assert memory._run("nothing") == "No memory found with key: nothing"
+    mlflow_manager.log_batch.assert_not_called()
+
+
+def test_legacy_json_is_imported_once(tmp_path):
+    legacy_path = tmp_path / "agent_memory.json"
+    legacy_path.write_text(json.dumps({
+        "colour": {"value": "blue", "context": None, "timestamp": "2024-01-01T00:00:00", "access_count": 2}
+    }))
+
+    memory = Memory(memory_dir=str(tmp_path))
+    assert memory._run("colour") == "blue"
+    assert _access_count(memory, "colour") == 3
+
+    # Later changes to the snapshot are ignored: the database is the store now
+    legacy_path.write_text(json.dumps({
+        "colour": {"value": "red", "access_count": 0},
+        "size": {"value": "large"}
+    }))
+    reopened = Memory(memory_dir=str(tmp_path))
+    assert reopened._run("colour") == "blue"
+    assert reopened._run("size") == "No memory found with key: size"
+    assert _access_count(reopened, "colour") == 4
@@ -0,0 +1,19 @@
+import pytest
+
+pytest.importorskip("crewai")
+pytest.importorskip("mlflow")
+
+from main.tools.langchain import LangChainToolRegistry
+
+
+def test_registry_methods_follow_a_replaced_tools_dict():
+    registry = LangChainToolRegistry()
+    adapter = object()
+    registry.tools = {"search": adapter}
+
+    assert registry.get_tool("search") is adapter
+    assert registry.get_tool("missing") is None
+    assert registry.list_tools() == [adapter]
+
+    registry.clear()
+    assert registry.tools == {} and registry.get_tool("search") is None
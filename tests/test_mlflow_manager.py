@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("mlflow")
+
+from main.utils import mlflow_manager
+from main.utils.mlflow_manager import MLflowManager
+
+
+def _manager():
+    # Skip __init__: it reads the YAML config and talks to the tracking server
+    manager = MLflowManager.__new__(MLflowManager)
+    manager.config = {}
+    manager.client = mock.Mock()
+    manager.async_logging = False
+    return manager
+
+
+def test_log_batch_starts_a_run_when_none_is_active():
+    manager = _manager()
+    started = SimpleNamespace(info=SimpleNamespace(run_id="started-run"))
+
+    with mock.patch.object(mlflow_manager.mlflow, "active_run", return_value=None), \
+            mock.patch.object(mlflow_manager.mlflow, "start_run", return_value=started) as start_run:
+        manager.log_task_metrics("task-1", {"execution_time": 1.5})
+
+    start_run.assert_called_once_with()
+    run_id = manager.client.log_batch.call_args.args[0]
+    metrics = manager.client.log_batch.call_args.kwargs["metrics"]
+    assert run_id == "started-run"
+    assert [(metric.key, metric.value) for metric in metrics] == [("task.task-1.execution_time", 1.5)]
+
+
+def test_log_batch_uses_the_active_run():
+    manager = _manager()
+    active = SimpleNamespace(info=SimpleNamespace(run_id="active-run"))
+
+    with mock.patch.object(mlflow_manager.mlflow, "active_run", return_value=active), \
+            mock.patch.object(mlflow_manager.mlflow, "start_run") as start_run:
+        manager.log_batch(tags={"stage": "test"})
+
+    start_run.assert_not_called()
+    assert manager.client.log_batch.call_args.args[0] == "active-run"
+
+
+def test_log_batch_with_run_id_skips_the_active_run_lookup():
+    manager = _manager()
+
+    with mock.patch.object(mlflow_manager.mlflow, "active_run") as active_run:
+        manager.log_batch(params={"priority": "HIGH"}, run_id="explicit-run")
+
+    active_run.assert_not_called()
+    assert manager.client.log_batch.call_args.args[0] == "explicit-run"
@@ -0,0 +1,93 @@
+import json
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("crewai")
+pytest.importorskip("mlflow")
+pytest.importorskip("requests")
+
+from main.tools import serper
+from main.tools.serper import SerperSearch
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(serper, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+@pytest.fixture
+def tool():
+    tool = SerperSearch(api_key="test-key")
+    session = mock.MagicMock()
+
+    def post(url, data, **kwargs):
+        query = json.loads(data)["q"]
+        response = mock.MagicMock()
+        response.content = json.dumps({"organic": [{"title": f"Result for {query}"}]}).encode()
+        response.__enter__.return_value = response
+        return response
+
+    session.post.side_effect = post
+    tool._sessions.session = session
+    return tool
+
+
+def test_repeated_query_is_served_from_the_cache(tool, clock):
+    first = tool._run("python")
+    clock.now += tool._CACHE_TTL - 1
+
+    assert tool._run("python") == first
+    assert "Result for python" in first
+    assert tool._sessions.session.post.call_count == 1
+
+    # Different arguments are a different cache entry
+    tool._run("python", num_results=5)
+    assert tool._sessions.session.post.call_count == 2
+
+
+def test_cached_results_expire(tool, clock):
+    tool._run("python")
+    clock.now += tool._CACHE_TTL
+
+    tool._run("python")
+
+    assert tool._sessions.session.post.call_count == 2
+
+
+def test_least_recently_used_query_is_evicted(tool, clock, monkeypatch):
+    monkeypatch.setattr(SerperSearch, "_CACHE_SIZE", 2)
+    tool._run("a")
+    tool._run("b")
+    tool._run("a")  # hit: "b" is now the least recently used
+    tool._run("c")
+    assert tool._sessions.session.post.call_count == 3
+
+    tool._run("a")
+    assert tool._sessions.session.post.call_count == 3
+    tool._run("b")
+    assert tool._sessions.session.post.call_count == 4
+
+
+def test_each_thread_gets_its_own_session():
+    tool = SerperSearch(api_key="test-key")
+    sessions = []
+    thread = threading.Thread(target=lambda: sessions.append(tool._get_session()))
+    thread.start()
+    thread.join()
+
+    assert tool._get_session() is tool._get_session()
+    assert sessions[0] is not tool._get_session()
+    assert tool._get_session().headers["X-API-KEY"] == "test-key"
@@ -0,0 +1,202 @@
+import random
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("crewai")
+pytest.importorskip("mlflow")
+
+from main.tools import task as task_module
+from main.tools.task import TaskMasterTools
+
+_STATUSES = ("PENDING", "IN_PROGRESS", "COMPLETED", "FAILED")
+_PRIORITY_WEIGHT = {"HIGH": 3, "MEDIUM": 2, "LOW": 1}
+# "URGENT" isn't a known priority and sorts with the lowest
+_PRIORITIES = ("HIGH", "MEDIUM", "LOW", "URGENT")
+_DUE_DATES = (None, "2024-01-15", "2024-03-01", "2024-06-30")
+
+
+@pytest.fixture
+def tools(tmp_path, monkeypatch):
+    # Artifacts are staged under the working directory; MLflow calls go to a mock
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(task_module, "get_manager", mock.Mock)
+    tools = TaskMasterTools()
+    yield tools
+    tools.flush_mlflow(timeout=5)
+
+
+def _scan_next_task(tools, request_id):
+    """The pending task get_next_task should pick, found by scanning every task."""
+    pending = [
+        tools.tasks[task_id] for task_id in tools.requests[request_id].tasks
+        if tools.tasks[task_id].status == "PENDING"
+    ]
+    # min() keeps the first of equal keys, i.e. the oldest task
+    return min(
+        pending,
+        key=lambda task: (-_PRIORITY_WEIGHT.get(task.priority, 0), task.due_date or "9999-12-31"),
+        default=None
+    )
+
+
+def _scan_task_summary(tools, request_id):
+    counts = dict.fromkeys(_STATUSES, 0)
+    for task_id in tools.requests[request_id].tasks:
+        counts[tools.tasks[task_id].status] += 1
+    return counts
+
+
+def _new_tasks(rng):
+    return [{"title": f"t{rng.randrange(1000)}", "description": "d"} for _ in range(rng.randint(1, 4))]
+
+
+def _check_bookkeeping(tools):
+    for summary in tools.list_requests()["requests"]:
+        assert summary["task_summary"] == _scan_task_summary(tools, summary["id"])
+        assert summary["total_tasks"] == len(tools.requests[summary["id"]].tasks)
+
+    context = tools._get_context_metrics()
+    statuses = [task.status for task in tools.tasks.values()]
+    assert context["pending_task_count"] == statuses.count("PENDING")
+    assert context["in_progress_task_count"] == statuses.count("IN_PROGRESS")
+
+
+def test_get_next_task_orders_by_priority_then_due_date_then_age(tools):
+    request_id = tools.request_planning("plan", [{"title": "a", "description": "d"}], priority="LOW")["requestId"]
+    tools.add_tasks_to_request(request_id, [{"title": "b", "description": "d"}], priority="HIGH", due_date="2024-05-01")
+    tools.add_tasks_to_request(request_id, [{"title": "c", "description": "d"}], priority="HIGH", due_date="2024-02-01")
+    tools.add_tasks_to_request(request_id, [{"title": "d", "description": "d"}], priority="HIGH", due_date="2024-02-01")
+
+    order = [tools.get_next_task(request_id)["task"]["title"] for _ in range(4)]
+
+    assert order == ["c", "d", "b", "a"]
+    assert tools.get_next_task(request_id)["status"] == "tasks_in_progress"
+
+
+def test_updated_and_deleted_tasks_are_rescheduled(tools):
+    planned = tools.request_planning("plan", [{"title": t, "description": "d"} for t in "abc"])
+    request_id = planned["requestId"]
+    a, b, c = (task["id"] for task in planned["tasks"])
+
+    tools.update_task(request_id, c, priority="HIGH")
+    tools.delete_task(request_id, a)
+
+    assert tools.get_next_task(request_id)["task"]["id"] == c
+    assert tools.get_next_task(request_id)["task"]["id"] == b
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_bookkeeping_matches_a_full_scan(tools, seed):
+    rng = random.Random(seed)
+    request_ids = [
+        tools.request_planning(
+            f"request {n}", _new_tasks(rng), priority=rng.choice(_PRIORITIES), due_date=rng.choice(_DUE_DATES)
+        )["requestId"]
+        for n in range(2)
+    ]
+
+    for _ in range(150):
+        request_id = rng.choice(request_ids)
+        task_ids = tools.requests[request_id].tasks
+        action = rng.choice(("next", "next", "done", "update", "delete", "add"))
+
+        if action == "next":
+            expected = _scan_next_task(tools, request_id)
+            result = tools.get_next_task(request_id)
+            if expected is None:
+                assert result["status"] != "next_task"
+            else:
+                assert result["status"] == "next_task"
+                assert result["task"]["id"] == expected.id
+        elif action == "add":
+            tools.add_tasks_to_request(
+                request_id, _new_tasks(rng), priority=rng.choice(_PRIORITIES), due_date=rng.choice(_DUE_DATES)
+            )
+        elif task_ids:
+            task_id = rng.choice(task_ids)
+            if action == "done":
+                tools.mark_task_done(request_id, task_id, status=rng.choice(("COMPLETED", "FAILED")))
+            elif action == "update":
+                tools.update_task(
+                    request_id, task_id, priority=rng.choice(_PRIORITIES), due_date=rng.choice(_DUE_DATES)
+                )
+            else:
+                tools.delete_task(request_id, task_id)
+
+        _check_bookkeeping(tools)
+
+
+def _batch(manager, run_id, metrics=None, params=None, tags=None):
+    return (None, (manager, run_id), {"metrics": metrics or {}, "params": params or {}, "tags": tags or {}})
+
+
+def test_merge_batches_combines_adjacent_batches_for_the_same_run():
+    manager = mock.Mock()
+    call = (manager.log_artifact, ("request.json",), {"run_id": "a"})
+    pending = [
+        _batch(manager, "a", metrics={"m1": 1.0}),
+        _batch(manager, "a", params={"p": "x"}, tags={"t": "y"}),
+        call,
+        _batch(manager, "a", metrics={"m2": 2.0}),
+        _batch(manager, "b", metrics={"m3": 3.0}),
+    ]
+
+    merged = TaskMasterTools._merge_batches(pending)
+
+    assert merged == [
+        _batch(manager, "a", metrics={"m1": 1.0}, params={"p": "x"}, tags={"t": "y"}),
+        call,
+        _batch(manager, "a", metrics={"m2": 2.0}),
+        _batch(manager, "b", metrics={"m3": 3.0}),
+    ]
+
+
+def test_merge_batches_keeps_repeated_metric_keys_apart():
+    manager = mock.Mock()
+    pending = [_batch(manager, "a", metrics={"m": 1.0}), _batch(manager, "a", metrics={"m": 2.0})]
+
+    assert TaskMasterTools._merge_batches(pending) == pending
+
+
+def test_merge_batches_respects_the_log_batch_limits():
+    manager = mock.Mock()
+    metrics = [_batch(manager, "a", metrics={f"m{n}.{i}": 0.0 for i in range(600)}) for n in range(2)]
+    params_and_tags = [
+        _batch(manager, "a", params={f"p{i}": "x" for i in range(30)}, tags={f"t{i}": "y" for i in range(30)}),
+        _batch(manager, "a", params={f"q{i}": "x" for i in range(30)}, tags={f"u{i}": "y" for i in range(30)}),
+    ]
+    # Another manager's batch for the same run ID isn't merged either
+    other_manager = [_batch(manager, "a", metrics={"m": 1.0}), _batch(mock.Mock(), "a", metrics={"n": 1.0})]
+
+    assert len(TaskMasterTools._merge_batches(metrics)) == 2
+    assert len(TaskMasterTools._merge_batches(params_and_tags)) == 2
+    assert len(TaskMasterTools._merge_batches(other_manager)) == 2
+
+
+def test_worker_sends_merged_batches_to_the_instance_manager(tools):
+    manager = tools.mlflow_manager = mock.Mock()
+
+    tools._queue_batch("run", metrics={"m1": 1.0})
+    tools._queue_batch("run", metrics={"m2": 2.0}, tags={"t": "y"})
+    tools._queue_call(manager.end_run, "run")
+    tools.flush_mlflow()
+
+    manager.log_batch.assert_called_once_with(run_id="run", metrics={"m1": 1.0, "m2": 2.0}, params={}, tags={"t": "y"})
+    manager.end_run.assert_called_once_with("run")
+
+
+def test_flush_mlflow_gives_up_after_its_timeout(tools):
+    release = threading.Event()
+    tools._queue_call(release.wait)
+
+    started = time.monotonic()
+    tools.flush_mlflow(timeout=0.2)
+    elapsed = time.monotonic() - started
+
+    release.set()
+    tools.flush_mlflow()
+    assert 0.2 <= elapsed < 1.0
+    assert tools._mlflow_queue.unfinished_tasks == 0